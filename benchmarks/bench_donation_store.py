@@ -0,0 +1,70 @@
+"""
+Memory benchmark: list of donation dicts vs. the columnar DonationStore.
+
+Usage:
+    python benchmarks/bench_donation_store.py [count ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# The application module validates its configuration at import time
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "123456:benchmark")
+os.environ.setdefault("CHAT_ID", "1")
+os.environ.setdefault("LNBITS_READONLY_API_KEY", "benchmark")
+os.environ.setdefault("LNBITS_URL", "http://localhost")
+os.environ.setdefault("DONATIONS_FILE", os.path.join(tempfile.gettempdir(), "bench-donations.json"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taschengeld import DonationStore  # noqa: E402
+
+MEMOS = ["Oma", "Opa", "Happy Birthday!", "Taschengeld", "No Memo", "Zahnfee", "Weihnachten"]
+
+def make_donations(count):
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            "date": (start + timedelta(seconds=37 * i, microseconds=i)).isoformat(),
+            "memo": MEMOS[i % len(MEMOS)],
+            "amount": (i % 5000 + 1) * 1.0
+        }
+        for i in range(count)
+    ]
+
+def measure(build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+def main(counts):
+    print(f"{'count':>8} {'dicts MiB':>10} {'store MiB':>10} {'ratio':>6} {'iter dicts s':>13} {'rows store s':>13} {'total store s':>14}")
+    for count in counts:
+        # Build from JSON-like input each time, as load_donations does
+        dicts, dict_bytes, _ = measure(lambda: make_donations(count))
+        source = make_donations(count)
+        store, store_bytes, _ = measure(lambda: DonationStore(source))
+
+        started = time.perf_counter()
+        sum(d["amount"] for d in dicts)
+        iter_dicts = time.perf_counter() - started
+
+        started = time.perf_counter()
+        sum(amount_msat for _, _, amount_msat in store.view().rows())
+        iter_store = time.perf_counter() - started
+
+        started = time.perf_counter()
+        store.view().total_msat
+        total_store = time.perf_counter() - started
+
+        print(f"{count:>8} {dict_bytes / 2**20:>10.2f} {store_bytes / 2**20:>10.2f} "
+              f"{dict_bytes / store_bytes:>6.1f} {iter_dicts:>13.4f} {iter_store:>13.4f} {total_store:>14.4f}")
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 300_000])
@@ -0,0 +1,57 @@
+"""
+JSON benchmark: the previous stdlib encoding (indent=4 on disk) vs. the
+serialization layer (json_dumps/json_loads, orjson when installed).
+
+Usage:
+    python benchmarks/bench_json.py [count ...]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+# The application module validates its configuration at import time
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "123456:benchmark")
+os.environ.setdefault("CHAT_ID", "1")
+os.environ.setdefault("LNBITS_READONLY_API_KEY", "benchmark")
+os.environ.setdefault("LNBITS_URL", "http://localhost")
+os.environ.setdefault("DONATIONS_FILE", os.path.join(tempfile.gettempdir(), "bench-donations.json"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from taschengeld import JSON_BACKEND, DonationStore, json_dumps, json_loads  # noqa: E402
+from bench_donation_store import make_donations  # noqa: E402
+
+def best_of(func, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return result, min(timings)
+
+def main(counts):
+    print(f"backend: {JSON_BACKEND}")
+    print(f"{'count':>8} {'old enc s':>10} {'new enc s':>10} {'old dec s':>10} {'new dec s':>10} "
+          f"{'old MiB':>8} {'new MiB':>8} {'api enc s':>10}")
+    for count in counts:
+        raw = make_donations(count)
+        state = {"total_donations": sum(d["amount"] for d in raw), "archived_count": 0, "donations": raw}
+        view = DonationStore(raw).view()
+
+        # Donations file, as save_donations/load_donations wrote and read it before
+        old_bytes, old_encode = best_of(lambda: json.dumps(state, ensure_ascii=False, indent=4).encode('utf-8'))
+        _, old_decode = best_of(lambda: json.loads(old_bytes.decode('utf-8')))
+
+        new_bytes, new_encode = best_of(lambda: json_dumps(state))
+        _, new_decode = best_of(lambda: json_loads(new_bytes))
+
+        # API response straight from the columnar store, as /api/donations serves it
+        _, api_encode = best_of(lambda: json_dumps({"donations": view}))
+
+        print(f"{count:>8} {old_encode:>10.4f} {new_encode:>10.4f} {old_decode:>10.4f} {new_decode:>10.4f} "
+              f"{len(old_bytes) / 2**20:>8.2f} {len(new_bytes) / 2**20:>8.2f} {api_encode:>10.4f}")
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
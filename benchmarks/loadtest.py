@@ -0,0 +1,398 @@
+"""
+Load test for the dashboard HTTP routes.
+
+Starts a local LNbits stub (with configurable latency) and the Flask app in a
+separate process, then simulates concurrent browsers that follow the polling
+pattern of static/js/script.js:
+
+    page load:  GET /donations, GET /api/donations + GET /donations_updates
+    every N s:  GET /donations_updates, GET /api/donations?since=<count> on changes
+                (GET /api/donations after archiving)
+    (plus an occasional GET /status from a monitoring client)
+
+The stub receives new donation payments at --payment-rate per second and the
+app runs its payments polling (every --fetch-interval seconds, in a separate
+poller process for --role dashboard), so donation_count changes and the
+incremental ?since= path is exercised while ingestion runs alongside.
+
+It reports p50/p95/p99 latency and error rate per route, and the upstream
+amplification (LNbits requests per client request, by LNbits path). With
+--max-p95 and --max-error-rate it exits non-zero, so it can run as a
+regression check.
+
+Usage:
+    python benchmarks/loadtest.py --clients 50 --duration 30 --upstream-latency 100
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LNURLP_ID = "loadtest"
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+# --------------------- LNbits Stub ---------------------
+
+class LNbitsStub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port, latency):
+        super().__init__(("127.0.0.1", port), LNbitsStubHandler)
+        self.latency = latency
+        self.payment_list = []  # Newest first, as LNbits returns them
+        self.payments = b"[]"
+        self.request_counts = {}
+        self.count_lock = threading.Lock()
+
+    @property
+    def request_count(self):
+        with self.count_lock:
+            return sum(self.request_counts.values())
+
+    def count(self, path):
+        with self.count_lock:
+            self.request_counts[path] = self.request_counts.get(path, 0) + 1
+
+    def add_payment(self):
+        """
+        Receive a new donation through the load test Pay-Link.
+        """
+        with self.count_lock:
+            number = len(self.payment_list)
+            amount_msat = (number % 3000 + 1) * 1000
+            self.payment_list.insert(0, {
+                "payment_hash": f"loadtest-{number}",
+                "amount": amount_msat,
+                "memo": f"Load test payment {number}",
+                "status": "success",
+                "time": int(time.time()),
+                "extra": {"link": LNURLP_ID, "comment": f"Load test {number % 50}", "extra": str(amount_msat)}
+            })
+            self.payments = json.dumps(self.payment_list).encode()
+
+    def receive_payments(self, rate, stop):
+        while rate > 0 and not stop.wait(1 / rate):
+            self.add_payment()
+
+class LNbitsStubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        self.server.count(path)
+        time.sleep(self.server.latency)
+        if path == "/lnurlp/api/v1/links":
+            body = json.dumps([{
+                "id": LNURLP_ID,
+                "username": "piggy",
+                "description": "Load Test Piggy",
+                "lnurl": "LNURL1LOADTEST"
+            }]).encode()
+        elif path == "/api/v1/wallet":
+            body = json.dumps({"balance": 2_100_000}).encode()
+        elif path == "/api/v1/payments":
+            body = self.server.payments
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+# --------------------- Simulated Browsers ---------------------
+
+class Results:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.lock = threading.Lock()
+
+    def record(self, route, seconds, ok):
+        with self.lock:
+            self.latencies.setdefault(route, []).append(seconds)
+            if not ok:
+                self.errors[route] = self.errors.get(route, 0) + 1
+
+    @property
+    def total_requests(self):
+        return sum(len(values) for values in self.latencies.values())
+
+    @property
+    def total_errors(self):
+        return sum(self.errors.values())
+
+def timed_get(session, base_url, path, route, results):
+    started = time.perf_counter()
+    try:
+        response = session.get(base_url + path, timeout=30)
+        ok = response.status_code == 200
+        data = response.json() if ok and response.headers.get("Content-Type", "").startswith("application/json") else None
+    except Exception:
+        ok, data = False, None
+    results.record(route, time.perf_counter() - started, ok)
+    return data
+
+def browser(base_url, deadline, poll_interval, results, monitor):
+    session = requests.Session()
+    timed_get(session, base_url, "/donations", "/donations", results)
+    initial = timed_get(session, base_url, "/api/donations", "/api/donations", results)
+    timed_get(session, base_url, "/donations_updates", "/donations_updates", results)
+    count = initial["donation_count"] if initial else 0
+    archived = initial["archived_count"] if initial else 0
+
+    while time.monotonic() < deadline:
+        if monitor:
+            timed_get(session, base_url, "/status", "/status", results)
+        update = timed_get(session, base_url, "/donations_updates", "/donations_updates", results)
+        if update and update["archived_count"] != archived:
+            # Archiving renumbers the hot list: reload it like the page does
+            reloaded = timed_get(session, base_url, "/api/donations", "/api/donations", results)
+            if reloaded:
+                count, archived = reloaded["donation_count"], reloaded["archived_count"]
+        elif update and update["donation_count"] != count:
+            delta = timed_get(session, base_url, f"/api/donations?since={count}", "/api/donations?since", results)
+            if delta:
+                count = delta["donation_count"]
+        time.sleep(max(0.0, min(poll_interval, deadline - time.monotonic())))
+
+# --------------------- Runner ---------------------
+
+def seed_state(directory, donation_count):
+    start = datetime.utcnow() - timedelta(days=30)
+    donations = [
+        {"date": (start + timedelta(minutes=i)).isoformat(), "memo": f"Load test {i % 50}", "amount": i % 3000 + 1}
+        for i in range(donation_count)
+    ]
+    with open(os.path.join(directory, "donations.json"), "w", encoding="utf-8") as f:
+        json.dump({"total_donations": sum(d["amount"] for d in donations), "donations": donations}, f)
+
+def import_app():
+    sys.path.insert(0, ROOT)
+    import taschengeld
+    # Telegram is not part of the measurement
+    taschengeld.notify_subscribers = lambda kind, text, **kwargs: True
+    return taschengeld
+
+def serve_app(port):
+    """
+    Entry point of the app process: serve the Flask app with a threaded server
+    (and, with PROCESS_ROLE=all, run the scheduler as the app does).
+    """
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    taschengeld = import_app()
+    if taschengeld.PROCESS_ROLE == "all":
+        threading.Thread(target=taschengeld.start_scheduler, daemon=True).start()
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    make_server("127.0.0.1", port, taschengeld.app, threaded=True, request_handler=QuietHandler).serve_forever()
+
+def run_poller():
+    """
+    Entry point of the poller process used with --role dashboard.
+    """
+    taschengeld = import_app()
+    taschengeld.get_lnurlp_info(taschengeld.LNURLP_ID)
+    taschengeld.start_scheduler()
+    threading.Event().wait()
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+def wait_for_dashboard(base_url, timeout=30):
+    """
+    Wait until the dashboard page renders (with --role dashboard only once the
+    poller has published the Pay-Link).
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(base_url + "/donations", timeout=5).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    return False
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="piggy-loadtest-")
+    seed_state(workdir, args.donations)
+
+    stub = LNbitsStub(free_port(), args.upstream_latency / 1000)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+
+    app_port = free_port()
+    env = dict(
+        os.environ,
+        TELEGRAM_BOT_TOKEN="123456:loadtest",
+        CHAT_ID="1",
+        LNBITS_READONLY_API_KEY="loadtest",
+        LNBITS_URL=f"http://127.0.0.1:{stub.server_address[1]}",
+        LNURLP_ID=LNURLP_ID,
+        PROCESS_ROLE=args.role,
+        DONATIONS_FILE=os.path.join(workdir, "donations.json"),
+        PROCESSED_PAYMENTS_FILE=os.path.join(workdir, "processed_payments.txt"),
+        CURRENT_BALANCE_FILE=os.path.join(workdir, "current-balance.txt"),
+        STATE_SNAPSHOT_FILE=os.path.join(workdir, "state-snapshot.json"),
+        DONATION_ARCHIVE_DIR=os.path.join(workdir, "donation-archive"),
+        ASSET_BUILD_DIR=os.path.join(workdir, "dist"),
+        FORBIDDEN_WORDS_FILE=os.path.join(ROOT, "forbidden_words.txt"),
+        LOG_LEVEL="WARNING",
+        # Only the payments polling runs; the other jobs do not affect the dashboard
+        PAYMENTS_FETCH_INTERVAL=str(args.fetch_interval),
+        WALLET_INFO_UPDATE_INTERVAL="0",
+        WALLET_BALANCE_NOTIFICATION_INTERVAL="0",
+        LEDGER_SYNC_INTERVAL="0",
+    )
+    processes = []
+    if args.role == "dashboard":
+        processes.append(subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--run-poller"],
+            cwd=workdir, env=dict(env, PROCESS_ROLE="poller")
+        ))
+    processes.append(subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve-app", str(app_port)],
+        cwd=workdir, env=env
+    ))
+    stop_payments = threading.Event()
+    try:
+        base_url = f"http://127.0.0.1:{app_port}"
+        if not wait_for_port(app_port) or not wait_for_dashboard(base_url):
+            print("App did not start.", file=sys.stderr)
+            return 2
+        threading.Thread(target=stub.receive_payments, args=(args.payment_rate, stop_payments), daemon=True).start()
+
+        # Startup traffic (e.g. archiving) is not part of the measurement
+        upstream_before = dict(stub.request_counts)
+        results = Results()
+        deadline = time.monotonic() + args.duration
+        threads = []
+        for i in range(args.clients):
+            thread = threading.Thread(
+                target=browser,
+                args=(base_url, deadline, args.poll_interval, results, i == 0),
+                daemon=True
+            )
+            threads.append(thread)
+            thread.start()
+            time.sleep(args.ramp_up / max(args.clients, 1))
+        for thread in threads:
+            thread.join()
+        upstream_by_path = {
+            path: count - upstream_before.get(path, 0)
+            for path, count in sorted(stub.request_counts.items())
+            if count > upstream_before.get(path, 0)
+        }
+        upstream_requests = sum(upstream_by_path.values())
+        payments_received = len(stub.payment_list)
+    finally:
+        stop_payments.set()
+        for process in processes:
+            process.terminate()
+            process.wait(timeout=10)
+        stub.shutdown()
+
+    report = {
+        "clients": args.clients,
+        "duration": args.duration,
+        "upstream_latency_ms": args.upstream_latency,
+        "requests": results.total_requests,
+        "error_rate": results.total_errors / max(results.total_requests, 1),
+        "payments_received": payments_received,
+        "upstream_requests": upstream_requests,
+        "upstream_requests_by_path": upstream_by_path,
+        "upstream_amplification": upstream_requests / max(results.total_requests, 1),
+        "routes": {
+            route: {
+                "count": len(values),
+                "errors": results.errors.get(route, 0),
+                "p50_ms": percentile(values, 0.50) * 1000,
+                "p95_ms": percentile(values, 0.95) * 1000,
+                "p99_ms": percentile(values, 0.99) * 1000,
+            }
+            for route, values in sorted(results.latencies.items())
+        }
+    }
+    all_latencies = [value for values in results.latencies.values() for value in values]
+    report["p95_ms"] = percentile(all_latencies, 0.95) * 1000
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'route':<26} {'count':>7} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for route, stats in report["routes"].items():
+            print(f"{route:<26} {stats['count']:>7} {stats['errors']:>7} "
+                  f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f}")
+        print(f"\n{report['requests']} requests from {args.clients} clients, "
+              f"error rate {report['error_rate']:.2%}, overall p95 {report['p95_ms']:.1f} ms")
+        print(f"{upstream_requests} LNbits requests, amplification {report['upstream_amplification']:.3f} per client request "
+              f"({', '.join(f'{path}: {count}' for path, count in upstream_by_path.items()) or 'none'})")
+        print(f"{payments_received} payments received by the stub during the test")
+
+    failed = False
+    if args.max_p95 is not None and report["p95_ms"] > args.max_p95:
+        print(f"FAIL: p95 {report['p95_ms']:.1f} ms exceeds {args.max_p95} ms", file=sys.stderr)
+        failed = True
+    if args.max_error_rate is not None and report["error_rate"] > args.max_error_rate:
+        print(f"FAIL: error rate {report['error_rate']:.2%} exceeds {args.max_error_rate:.2%}", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == "--serve-app":
+        serve_app(int(sys.argv[2]))
+        return 0
+    if len(sys.argv) == 2 and sys.argv[1] == "--run-poller":
+        run_poller()
+        return 0
+
+    parser = argparse.ArgumentParser(description="Load test the dashboard HTTP routes.")
+    parser.add_argument("--clients", type=int, default=20, help="Concurrent simulated browsers (default: 20).")
+    parser.add_argument("--duration", type=float, default=30, help="Test duration in seconds (default: 30).")
+    parser.add_argument("--poll-interval", type=float, default=5, help="Seconds between update checks, as in script.js (default: 5).")
+    parser.add_argument("--ramp-up", type=float, default=2, help="Seconds over which clients are started (default: 2).")
+    parser.add_argument("--upstream-latency", type=float, default=50, help="LNbits stub latency in ms (default: 50).")
+    parser.add_argument("--donations", type=int, default=1000, help="Donations seeded into the app state (default: 1000).")
+    parser.add_argument("--payment-rate", type=float, default=1, help="New donation payments per second at the stub, 0 for none (default: 1).")
+    parser.add_argument("--fetch-interval", type=int, default=2, help="PAYMENTS_FETCH_INTERVAL of the app in seconds (default: 2).")
+    parser.add_argument("--role", choices=("all", "dashboard"), default="all", help="PROCESS_ROLE of the app under test.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    parser.add_argument("--max-p95", type=float, help="Fail if the overall p95 latency (ms) is above this.")
+    parser.add_argument("--max-error-rate", type=float, help="Fail if the error rate (0-1) is above this.")
+    return run(parser.parse_args())
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,21 @@
 // script.js
 
 let totalDonations = 0; // Total donations
-let transactionsData = []; // Store transaction history
-const rowsPerPage = 10; // Number of rows to display per page
-let currentPage = 1;
+let transactionsData = []; // Store transaction history (oldest first, append-only)
+let archivedLoaded = 0; // Number of archived donations loaded in front of transactionsData
+let archivedCount = 0; // Number of donations the server had archived when the hot list was loaded
+let archiveMonths = []; // Archived months (YYYY-MM) not loaded yet, oldest first
+let loadingArchive = false;
 let lastUpdate = null; // Timestamp of the last update
 let highlightThreshold = 2100; // Default threshold
 
+// Virtualized table state: only the rows inside the viewport are in the DOM
+const OVERSCAN_ROWS = 5; // Extra rows rendered above and below the viewport
+let rowHeight = 0; // Measured height of a table row in pixels
+let renderedFirst = -1; // Index (newest first) of the first rendered row
+let renderedLast = -1; // Index (newest first) after the last rendered row
+let renderScheduled = false;
+
 // Darkmode Elements
 let darkmodeCheckbox; // Wird nach DOMContentLoaded initialisiert
 
@@ -79,22 +88,35 @@ function formatDate(dateString) {
     }
 }
 
-// Function to update the UI with new data
-function updateDonations(data) {
-    console.log('Updating donations with data:', data); // Debugging
-    totalDonations = data.total_donations;
-    document.getElementById('totalDonations').textContent = `${totalDonations} Sats`;
-
-    // Update latest donation
-    if (data.donations.length > 0) {
-        const latestDonation = data.donations[data.donations.length - 1];
-        document.getElementById('donationHistory').textContent = `Letztes Sparen: ${latestDonation.amount} Sats - "${latestDonation.memo}"`;
-    } else {
-        document.getElementById('donationHistory').textContent = 'Letztes Sparen: Noch nichts.';
+// Function to update the total and latest donation in place
+function updateSummary(total) {
+    if (total !== totalDonations) {
+        totalDonations = total;
+        document.getElementById('totalDonations').textContent = `${totalDonations} Sats`;
+    }
+
+    const history = document.getElementById('donationHistory');
+    let text = 'Letztes Sparen: Noch nichts.';
+    if (transactionsData.length > 0) {
+        const latestDonation = transactionsData[transactionsData.length - 1];
+        text = `Letztes Sparen: ${latestDonation.amount} Sats - "${latestDonation.memo}"`;
     }
+    if (history.textContent !== text) {
+        history.textContent = text;
+    }
+}
+
+// Function to replace the UI with a full data set
+function updateDonations(data) {
+    console.log(`Loaded ${data.donations.length} donations`); // Debugging
 
     // Update transactions data
     transactionsData = data.donations;
+    archivedLoaded = 0;
+    archivedCount = data.archived_count || 0;
+    archiveMonths = data.archive_months || [];
+    totalDonations = null; // Force the total to be redrawn
+    updateSummary(data.total_donations);
 
     // Update Lightning Address and LNURL
     updateLightningAddress(data.lightning_address, data.lnurl);
@@ -105,9 +127,32 @@ function updateDonations(data) {
         console.log(`Hervorhebungsschwellenwert aktualisiert auf: ${highlightThreshold} sats`);
     }
 
-    // Render the table and pagination
-    renderTable();
-    renderPagination();
+    renderTable(true);
+}
+
+// Function to apply only the donations that are new since the last update
+function appendDonations(data) {
+    const newDonations = data.donations;
+    if (newDonations.length === 0) {
+        updateSummary(data.total_donations);
+        return;
+    }
+    console.log(`Appending ${newDonations.length} new donations`); // Debugging
+
+    for (const donation of newDonations) {
+        transactionsData.push(donation);
+    }
+    updateSummary(data.total_donations);
+
+    const viewport = document.getElementById('transactions-viewport');
+    if (renderedFirst === 0 && viewport.scrollTop === 0) {
+        // The newest rows are visible: insert the new rows at the top
+        insertNewestRows(newDonations);
+    } else {
+        // Keep the rows the user is looking at in place
+        renderTable(true);
+        viewport.scrollTop += newDonations.length * rowHeight;
+    }
 }
 
 // Function to update the Lightning Address and LNURL in the DOM
@@ -128,60 +173,163 @@ function updateLightningAddress(lightningAddress, lnurl) {
     }
 }
 
-// Function to render the transaction table
-function renderTable() {
-    const tableBody = document.getElementById('transactions');
-    tableBody.innerHTML = '';
+// Function to build a single table row
+function createRow(transaction) {
+    const row = document.createElement('tr');
+
+    // Check if donation is greater than highlight threshold
+    if (transaction.amount > highlightThreshold) { // Use dynamic threshold
+        row.classList.add('highlight');
+    }
 
-    const startIndex = (currentPage - 1) * rowsPerPage;
-    const endIndex = startIndex + rowsPerPage;
-    const visibleTransactions = transactionsData.slice().reverse().slice(startIndex, endIndex);
+    for (const text of [formatDate(transaction.date), transaction.memo, `${transaction.amount} Sats`]) {
+        const cell = document.createElement('td');
+        cell.textContent = text;
+        row.appendChild(cell);
+    }
+    return row;
+}
+
+// Function to build a spacer row standing in for rows that are not rendered
+function createSpacer(id) {
+    const spacer = document.createElement('tr');
+    spacer.id = id;
+    spacer.className = 'spacer';
+    const cell = document.createElement('td');
+    cell.colSpan = 3;
+    spacer.appendChild(cell);
+    return spacer;
+}
+
+// Function to set the height of a spacer row
+function setSpacerHeight(spacer, rows) {
+    spacer.style.height = `${rows * rowHeight}px`;
+    spacer.style.display = rows > 0 ? '' : 'none';
+}
 
-    if (visibleTransactions.length === 0) {
+// Function to make sure the row height is known
+function measureRowHeight(tableBody) {
+    if (rowHeight > 0 || transactionsData.length === 0) {
+        return;
+    }
+    const probe = createRow(transactionsData[transactionsData.length - 1]);
+    tableBody.appendChild(probe);
+    rowHeight = probe.getBoundingClientRect().height || 48;
+    probe.remove();
+}
+
+// Function to render the rows of the transaction table that are inside the viewport
+function renderTable(force = false) {
+    const tableBody = document.getElementById('transactions');
+    const viewport = document.getElementById('transactions-viewport');
+    const total = transactionsData.length;
+
+    if (total === 0) {
         tableBody.innerHTML = '<tr><td colspan="3" class="no-data">Noch keine Ersparnisse.</td></tr>';
-    } else {
-        visibleTransactions.forEach((transaction) => {
-            const row = document.createElement('tr');
+        renderedFirst = renderedLast = -1;
+        return;
+    }
 
-            // Check if donation is greater than highlight threshold
-            if (transaction.amount > highlightThreshold) { // Use dynamic threshold
-                row.classList.add('highlight');
-            }
+    measureRowHeight(tableBody);
+    const visibleRows = Math.ceil(viewport.clientHeight / rowHeight) + 2 * OVERSCAN_ROWS;
+    const first = Math.max(0, Math.min(Math.floor(viewport.scrollTop / rowHeight) - OVERSCAN_ROWS, total - 1));
+    const last = Math.min(total, first + visibleRows);
 
-            row.innerHTML = `
-                <td>${formatDate(transaction.date)}</td>
-                <td>${transaction.memo}</td>
-                <td>${transaction.amount} Sats</td>
-            `;
-            tableBody.appendChild(row);
-        });
+    if (!force && first === renderedFirst && last === renderedLast) {
+        return;
+    }
+
+    // Rows are shown newest first
+    const fragment = document.createDocumentFragment();
+    const topSpacer = createSpacer('spacer-top');
+    setSpacerHeight(topSpacer, first);
+    fragment.appendChild(topSpacer);
+    for (let i = first; i < last; i++) {
+        fragment.appendChild(createRow(transactionsData[total - 1 - i]));
+    }
+    const bottomSpacer = createSpacer('spacer-bottom');
+    setSpacerHeight(bottomSpacer, total - last);
+    fragment.appendChild(bottomSpacer);
+
+    tableBody.replaceChildren(fragment);
+    renderedFirst = first;
+    renderedLast = last;
+
+    if (last === total && archiveMonths.length > 0) {
+        loadOlderDonations();
     }
 }
 
-// Function to render pagination
-function renderPagination() {
-    const pagination = document.getElementById('pagination');
-    pagination.innerHTML = '';
+// Function to insert new donations at the top of the rendered window
+function insertNewestRows(newDonations) {
+    const tableBody = document.getElementById('transactions');
+    const topSpacer = document.getElementById('spacer-top');
+    const bottomSpacer = document.getElementById('spacer-bottom');
+    if (!topSpacer || !bottomSpacer) {
+        renderTable(true);
+        return;
+    }
+
+    // Newest donation goes first, directly below the (empty) top spacer
+    const anchor = topSpacer.nextSibling;
+    for (let i = newDonations.length - 1; i >= 0; i--) {
+        tableBody.insertBefore(createRow(newDonations[i]), anchor);
+    }
+    renderedLast += newDonations.length;
+
+    // Drop rows that fell out of the rendered window
+    const viewport = document.getElementById('transactions-viewport');
+    const visibleRows = Math.ceil(viewport.clientHeight / rowHeight) + 2 * OVERSCAN_ROWS;
+    while (renderedLast - renderedFirst > visibleRows) {
+        bottomSpacer.previousSibling.remove();
+        renderedLast--;
+    }
+    setSpacerHeight(bottomSpacer, transactionsData.length - renderedLast);
+}
 
-    const totalPages = Math.ceil(transactionsData.length / rowsPerPage);
+// Function to number the donations that are still held by the server in memory
+function hotDonationCount() {
+    return transactionsData.length - archivedLoaded;
+}
 
-    for (let i = 1; i <= totalPages; i++) {
-        const pageLink = document.createElement('a');
-        pageLink.textContent = i;
-        pageLink.href = '#';
-        if (i === currentPage) {
-            pageLink.classList.add('active');
+// Function to load the next older archived month when the end of the table is reached
+async function loadOlderDonations() {
+    if (loadingArchive || archiveMonths.length === 0) {
+        return;
+    }
+    loadingArchive = true;
+    const month = archiveMonths[archiveMonths.length - 1];
+    try {
+        const response = await fetch(`/api/donations/archive/${month}`);
+        if (!response.ok) {
+            throw new Error(`Fehler beim Abrufen des Archivs ${month}`);
         }
-        pageLink.addEventListener('click', (e) => {
-            e.preventDefault();
-            currentPage = i;
-            renderTable();
-            renderPagination();
-        });
-        pagination.appendChild(pageLink);
+        const data = await response.json();
+        archiveMonths.pop();
+        // Older donations go to the front of the (oldest first) array, i.e. the bottom of the table
+        transactionsData = data.donations.concat(transactionsData);
+        archivedLoaded += data.donations.length;
+        renderTable(true);
+    } catch (error) {
+        console.error('Fehler beim Laden älterer Ersparnisse:', error);
+        showToast('Fehler beim Laden älterer Ersparnisse.', true);
+    } finally {
+        loadingArchive = false;
     }
 }
 
+// Function to re-render the visible rows at most once per animation frame while scrolling
+function onTableScroll() {
+    if (renderScheduled) {
+        return;
+    }
+    renderScheduled = true;
+    requestAnimationFrame(() => {
+        renderScheduled = false;
+        renderTable();
+    });
+}
+
 // Function to fetch initial donations data from the server
 async function fetchInitialDonations() {
     try {
@@ -223,16 +371,29 @@ async function checkForUpdates() {
         const data = await response.json();
         const serverUpdate = new Date(data.last_update);
 
-        if (!lastUpdate || serverUpdate > lastUpdate) {
+        if (!lastUpdate || serverUpdate > lastUpdate || data.donation_count !== hotDonationCount()
+            || data.archived_count !== archivedCount) {
             // New update detected
             lastUpdate = serverUpdate;
-            // Fetch the latest donations data
-            const donationsResponse = await fetch('/api/donations');
-            if (!donationsResponse.ok) {
-                throw new Error('Fehler beim Abrufen der aktualisierten Ersparnisse');
+            if (data.archived_count !== archivedCount || data.donation_count < hotDonationCount()) {
+                // Server history was reset or archived: reload everything
+                await fetchInitialDonations();
+            } else if (data.donation_count > hotDonationCount()) {
+                // Fetch only the donations we do not have yet
+                const donationsResponse = await fetch(`/api/donations?since=${hotDonationCount()}`);
+                if (!donationsResponse.ok) {
+                    throw new Error('Fehler beim Abrufen der aktualisierten Ersparnisse');
+                }
+                const donationsData = await donationsResponse.json();
+                if (donationsData.archived_count !== archivedCount) {
+                    // Archived in between: the offsets no longer match
+                    await fetchInitialDonations();
+                } else if (donationsData.since === hotDonationCount()) {
+                    appendDonations(donationsData);
+                }
+            } else {
+                updateSummary(data.total_donations);
             }
-            const donationsData = await donationsResponse.json();
-            updateDonations(donationsData);
         }
 
     } catch (error) {
@@ -275,11 +436,14 @@ function setupDarkmodeToggle() {
 }
 
 // Initialize on page load
-document.addEventListener("DOMContentLoaded", function() {
+document.addEventListener("DOMContentLoaded", async function() {
+    // Render only the visible rows while scrolling
+    document.getElementById('transactions-viewport').addEventListener('scroll', onTableScroll, { passive: true });
+    window.addEventListener('resize', onTableScroll);
+    // Setup Darkmode Toggle
+    setupDarkmodeToggle();
     // Fetch initial donations data
-    fetchInitialDonations();
+    await fetchInitialDonations();
     // Start checking for updates
     checkForUpdates();
-    // Setup Darkmode Toggle
-    setupDarkmodeToggle();
 });
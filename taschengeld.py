@@ -1,13 +1,17 @@
 import os
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+import queue
+import atexit
+import reprlib
 from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup, ParseMode
+from telegram.error import BadRequest, RetryAfter
 from dotenv import load_dotenv
 import requests
 import traceback
 from apscheduler.schedulers.background import BackgroundScheduler
-from flask import Flask, jsonify, request, render_template
-from datetime import datetime, timedelta
+from flask import Flask, Response, jsonify, request, render_template, send_from_directory, stream_with_context, url_for
+from datetime import datetime, timedelta, timezone
 import threading
 import qrcode
 import io
@@ -15,6 +19,41 @@ import base64
 import json
 from urllib.parse import urlparse
 import re
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+from array import array
+from flask.json.provider import DefaultJSONProvider
+import codecs
+import random
+import argparse
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import hashlib
+import mimetypes
+import mmap
+import sqlite3
+import hmac
+import csv
+import zlib
+import itertools
+import struct
+import bisect
+import unicodedata
+from functools import lru_cache
+from collections import deque
+
+try:
+    import brotli  # Optional: enables Brotli compression
+except ImportError:
+    brotli = None
+
+try:
+    import orjson  # Optional: faster JSON encoding and decoding
+except ImportError:
+    orjson = None
 
 # --------------------- Configuration and Setup ---------------------
 
@@ -31,11 +70,40 @@ try:
 except (TypeError, ValueError):
     raise EnvironmentError("CHAT_ID must be an integer.")
 
+# Notification Subscribers: comma-separated "chat_id" or "chat_id:kind+kind" entries
+# (kinds: transactions, balance, daily, live). CHAT_ID receives everything unless listed here.
+NOTIFICATION_KINDS = ("transactions", "balance", "daily", "live")
+TELEGRAM_SUBSCRIBERS = os.getenv("TELEGRAM_SUBSCRIBERS", "")
+TELEGRAM_CHAT_MIN_INTERVAL = float(os.getenv("TELEGRAM_CHAT_MIN_INTERVAL", "1"))  # Default: 1 second between messages per chat
+TELEGRAM_FANOUT_WORKERS = int(os.getenv("TELEGRAM_FANOUT_WORKERS", "8"))  # Default: 8 parallel sends
+
+# Live Status: one pinned message per chat, edited in place instead of new notifications
+TELEGRAM_LIVE_STATUS = os.getenv("TELEGRAM_LIVE_STATUS", "false").lower() in ("1", "true", "yes")  # Default: disabled
+TELEGRAM_LIVE_STATUS_INTERVAL = float(os.getenv("TELEGRAM_LIVE_STATUS_INTERVAL", "30"))  # Default: at most one edit per 30 seconds
+
+SUBSCRIBERS = {CHAT_ID: frozenset(NOTIFICATION_KINDS)}
+for entry in filter(None, (item.strip() for item in TELEGRAM_SUBSCRIBERS.split(","))):
+    chat, _, kinds = entry.partition(":")
+    try:
+        chat = int(chat)
+    except ValueError:
+        raise EnvironmentError(f"Invalid chat ID in TELEGRAM_SUBSCRIBERS: {entry}")
+    kinds = frozenset(kind.strip().lower() for kind in kinds.split("+") if kind.strip()) or frozenset(NOTIFICATION_KINDS)
+    unknown = kinds.difference(NOTIFICATION_KINDS)
+    if unknown:
+        raise EnvironmentError(f"Unknown notification kind(s) in TELEGRAM_SUBSCRIBERS: {', '.join(sorted(unknown))}")
+    SUBSCRIBERS[chat] = kinds
+
 # LNbits Configuration
 LNBITS_READONLY_API_KEY = os.getenv("LNBITS_READONLY_API_KEY")
 LNBITS_URL = os.getenv("LNBITS_URL")
 INSTANCE_NAME = os.getenv("INSTANCE_NAME", "LNbits Instance")
 
+# LNbits Circuit Breaker: stop calling LNbits while most recent requests fail
+LNBITS_BREAKER_FAILURE_RATE = float(os.getenv("LNBITS_BREAKER_FAILURE_RATE", "0.5"))  # Default: open at 50% failures
+LNBITS_BREAKER_WINDOW = int(os.getenv("LNBITS_BREAKER_WINDOW", "10"))  # Default: over the last 10 requests
+LNBITS_BREAKER_COOLDOWN = float(os.getenv("LNBITS_BREAKER_COOLDOWN", "30"))  # Default: probe again after 30 seconds
+
 # Extract domain from LNBITS_URL
 parsed_lnbits_url = urlparse(LNBITS_URL)
 LNBITS_DOMAIN = parsed_lnbits_url.netloc
@@ -47,11 +115,25 @@ LNURLP_ID = os.getenv("LNURLP_ID")
 BALANCE_CHANGE_THRESHOLD = int(os.getenv("BALANCE_CHANGE_THRESHOLD", "10"))  # Default: 10 sats
 HIGHLIGHT_THRESHOLD = int(os.getenv("HIGHLIGHT_THRESHOLD", "2100"))  # Default: 2100 sats
 LATEST_TRANSACTIONS_COUNT = int(os.getenv("LATEST_TRANSACTIONS_COUNT", "21"))  # Default: 21 transactions
+RECENT_PAYMENTS_CAPACITY = int(os.getenv("RECENT_PAYMENTS_CAPACITY", "500"))  # Default: keep the last 500 payments
+STATUS_PAYMENTS_WINDOW = int(os.getenv("STATUS_PAYMENTS_WINDOW", "21"))  # Default: 21 payments per /status page
 
 # Scheduler Intervals (in seconds)
 WALLET_INFO_UPDATE_INTERVAL = int(os.getenv("WALLET_INFO_UPDATE_INTERVAL", "86400"))  # Default: 86400 seconds (24 hours)
 WALLET_BALANCE_NOTIFICATION_INTERVAL = int(os.getenv("WALLET_BALANCE_NOTIFICATION_INTERVAL", "86400"))  # Default: 86400 seconds (24 hours)
 PAYMENTS_FETCH_INTERVAL = int(os.getenv("PAYMENTS_FETCH_INTERVAL", "60"))  # Default: 60 seconds (1 minute)
+LEDGER_SYNC_INTERVAL = int(os.getenv("LEDGER_SYNC_INTERVAL", "300"))  # Default: 300 seconds (5 minutes)
+
+# Adaptive Polling (optional)
+ADAPTIVE_POLLING = os.getenv("ADAPTIVE_POLLING", "false").lower() in ("1", "true", "yes")  # Default: disabled
+PAYMENTS_FETCH_MIN_INTERVAL = int(os.getenv("PAYMENTS_FETCH_MIN_INTERVAL", "15"))  # Default: 15 seconds after activity
+PAYMENTS_FETCH_MAX_INTERVAL = int(os.getenv("PAYMENTS_FETCH_MAX_INTERVAL", "600"))  # Default: 600 seconds when idle
+SCHEDULER_JITTER = float(os.getenv("SCHEDULER_JITTER", "0.1"))  # Default: +/-10% of the interval
+SCHEDULER_STAGGER = int(os.getenv("SCHEDULER_STAGGER", "5"))  # Default: 5 seconds between job start times
+
+# Process Role: "all" (poller and dashboard in one process), "poller" or "dashboard"
+PROCESS_ROLE = os.getenv("PROCESS_ROLE", "all").lower()  # Default: all
+STATE_SNAPSHOT_FILE = os.getenv("STATE_SNAPSHOT_FILE", "state-snapshot.json")
 
 # Flask Server Configuration
 APP_HOST = os.getenv("APP_HOST", "127.0.0.1")  # Default: localhost
@@ -61,6 +143,14 @@ APP_PORT = int(os.getenv("APP_PORT", "5009"))  # Default: port 5009
 PROCESSED_PAYMENTS_FILE = os.getenv("PROCESSED_PAYMENTS_FILE", "processed_payments.txt")
 CURRENT_BALANCE_FILE = os.getenv("CURRENT_BALANCE_FILE", "current-balance.txt")
 DONATIONS_FILE = os.getenv("DONATIONS_FILE", "donations.json")
+DONATION_INDEX_FILE = os.getenv("DONATION_INDEX_FILE", "donations-index.json")
+DONATION_INDEX_LOG = f"{DONATION_INDEX_FILE}.log"  # New index entries since DONATION_INDEX_FILE was written
+BALANCE_HISTORY_FILE = os.getenv("BALANCE_HISTORY_FILE", "balance-history.bin")
+LEDGER_FILE = os.getenv("LEDGER_FILE", "payments-ledger.sqlite3")
+LIVE_STATUS_FILE = os.getenv("LIVE_STATUS_FILE", "telegram-live-status.json")
+
+# Balance History Chart
+BALANCE_HISTORY_MAX_POINTS = int(os.getenv("BALANCE_HISTORY_MAX_POINTS", "1000"))  # Default: 1000 points per response
 
 # Donation Configuration
 DONATIONS_URL = os.getenv("DONATIONS_URL")  # Optional; no default value
@@ -71,6 +161,25 @@ INFORMATION_URL = os.getenv("INFORMATION_URL")  # New environment variable
 # Profanity Filter Configuration
 FORBIDDEN_WORDS_FILE = os.getenv("FORBIDDEN_WORDS_FILE", "forbidden_words.txt")
 
+# Donation History Tiering
+DONATION_HOT_DAYS = int(os.getenv("DONATION_HOT_DAYS", "90"))  # Default: 90 days, 0 keeps everything in memory
+DONATION_ARCHIVE_DIR = os.getenv("DONATION_ARCHIVE_DIR", "donation-archive")
+
+# History Backfill
+BACKFILL_CONCURRENCY = int(os.getenv("BACKFILL_CONCURRENCY", "8"))  # Default: 8 parallel requests
+BACKFILL_PAGE_SIZE = int(os.getenv("BACKFILL_PAGE_SIZE", "500"))  # Default: 500 payments per page
+BACKFILL_PAGE_OVERLAP = int(os.getenv("BACKFILL_PAGE_OVERLAP", "50"))  # Default: re-read 50 payments before each page
+BACKFILL_CHECKPOINT_DIR = os.getenv("BACKFILL_CHECKPOINT_DIR", "backfill-checkpoint")
+
+# Static Assets and Compression
+ASSET_BUILD_DIR = os.getenv("ASSET_BUILD_DIR")  # Default: static/dist next to this file
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # Default: 1024 bytes
+
+# Logging Configuration
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG").upper()  # Default: DEBUG
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()  # "text" or "json"
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "500"))  # Default: 500 characters
+
 # Validate essential environment variables (excluding Overwatch and DONATIONS_URL)
 required_vars = {
     "TELEGRAM_BOT_TOKEN": TELEGRAM_BOT_TOKEN,
@@ -79,6 +188,9 @@ required_vars = {
     "LNBITS_URL": LNBITS_URL
 }
 
+if PROCESS_ROLE not in ("all", "poller", "dashboard"):
+    raise EnvironmentError("PROCESS_ROLE must be one of: all, poller, dashboard.")
+
 missing_vars = [var for var, value in required_vars.items() if not value]
 if missing_vars:
     raise EnvironmentError(f"Required environment variables missing: {', '.join(missing_vars)}")
@@ -87,8 +199,58 @@ if missing_vars:
 bot = Bot(token=TELEGRAM_BOT_TOKEN)
 
 # --------------------- Logging Configuration ---------------------
+#
+# Log calls only enqueue the record; formatting and disk writes happen on a
+# background listener thread. Pass payloads as arguments (wrapped in
+# Payload) instead of building f-strings so their rendering is lazy and bounded.
+
+class Payload:
+    """
+    Log argument that renders a large object lazily and with bounded length.
+    """
+    __slots__ = ("value",)
+
+    _repr = reprlib.Repr()
+    _repr.maxlevel = 3
+    _repr.maxdict = 8
+    _repr.maxlist = 8
+    _repr.maxset = 8
+    _repr.maxstring = 120
+    _repr.maxother = 120
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        text = self._repr.repr(self.value)
+        if len(text) > LOG_PAYLOAD_MAX_CHARS:
+            text = text[:LOG_PAYLOAD_MAX_CHARS] + f"... [truncated, {len(text)} chars]"
+        return text
+
+class JSONLogFormatter(logging.Formatter):
+    """
+    Format log records as one JSON object per line.
+    """
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "thread": record.threadName,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves message formatting to the listener thread.
+    """
+    def prepare(self, record):
+        return record
+
 logger = logging.getLogger("lnbits_logger")
-logger.setLevel(logging.DEBUG)
+logger.setLevel(LOG_LEVEL)
 
 # File handler for detailed logs
 file_handler = RotatingFileHandler("app.log", maxBytes=5 * 1024 * 1024, backupCount=3)
@@ -99,13 +261,19 @@ console_handler = logging.StreamHandler()
 console_handler.setLevel(logging.INFO)
 
 # Log format
-formatter = logging.Formatter('[%(asctime)s] [%(levelname)s] %(message)s')
+if LOG_FORMAT == "json":
+    formatter = JSONLogFormatter()
+else:
+    formatter = logging.Formatter('[%(asctime)s] [%(levelname)s] %(message)s')
 file_handler.setFormatter(formatter)
 console_handler.setFormatter(formatter)
 
-# Add handlers to the logger
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
+# Route records through a queue to a background listener
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+logger.addHandler(DeferredQueueHandler(log_queue))
+log_listener.start()
+atexit.register(log_listener.stop)
 
 # --------------------- Helper Functions ---------------------
 
@@ -126,7 +294,7 @@ def load_forbidden_words(file_path):
                 word = line.strip()
                 if word:  # Avoid empty lines
                     forbidden.add(word.lower())
-        logger.debug(f"Loaded forbidden words from {file_path}: {forbidden}")
+        logger.debug("Loaded forbidden words from %s: %s", file_path, Payload(forbidden))
     except FileNotFoundError:
         logger.error(f"Forbidden words file not found at {file_path}.")
     except Exception as e:
@@ -134,6 +302,13 @@ def load_forbidden_words(file_path):
         logger.debug(traceback.format_exc())
     return forbidden
 
+@lru_cache(maxsize=4)
+def forbidden_words_pattern(forbidden_words):
+    """
+    Compile the regex matching any of the forbidden words (a frozenset) as whole words.
+    """
+    return re.compile(r'\b(' + '|'.join(map(re.escape, forbidden_words)) + r')\b', re.IGNORECASE)
+
 def sanitize_memo(memo, forbidden_words):
     """
     Sanitize the memo field by replacing forbidden words with asterisks.
@@ -149,12 +324,12 @@ def sanitize_memo(memo, forbidden_words):
         return "No Memo"
     
     # Log the type and value of memo for debugging
-    logger.debug(f"sanitize_memo called with memo type: {type(memo)} and value: {memo}")
+    logger.debug("sanitize_memo called with memo type: %s and value: %s", type(memo), Payload(memo))
     
     # Ensure memo is a string
     if not isinstance(memo, str):
         memo = str(memo)
-        logger.debug(f"Converted non-string memo to string: {memo}")
+        logger.debug("Converted non-string memo to string: %s", Payload(memo))
     
     # Function to replace the matched word with asterisks
     def replace_match(match):
@@ -165,11 +340,19 @@ def sanitize_memo(memo, forbidden_words):
     if not forbidden_words:
         return memo  # No forbidden words to sanitize
     
-    pattern = re.compile(r'\b(' + '|'.join(map(re.escape, forbidden_words)) + r')\b', re.IGNORECASE)
-    sanitized_memo = pattern.sub(replace_match, memo)
-    logger.debug(f"Sanitized Memo: Original: '{memo}' -> Sanitized: '{sanitized_memo}'")
+    sanitized_memo = forbidden_words_pattern(frozenset(forbidden_words)).sub(replace_match, memo)
+    logger.debug("Sanitized Memo: Original: '%s' -> Sanitized: '%s'", Payload(memo), Payload(sanitized_memo))
     return sanitized_memo
 
+def write_file_atomic(path, content):
+    """
+    Write bytes to a file via a temporary file and an atomic rename.
+    """
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
 def load_processed_payments():
     """
     Load already processed payment hashes from the tracking file into a set.
@@ -193,7 +376,7 @@ def add_processed_payment(payment_hash):
     try:
         with open(PROCESSED_PAYMENTS_FILE, 'a') as f:
             f.write(f"{payment_hash}\n")
-        logger.debug(f"Added payment hash {payment_hash} to processed payments.")
+        logger.debug("Added payment hash %s to processed payments.", payment_hash)
     except Exception as e:
         logger.error(f"Error adding processed payment: {e}")
         logger.debug(traceback.format_exc())
@@ -235,111 +418,1661 @@ def save_current_balance(balance):
         logger.error(f"Error saving current balance: {e}")
         logger.debug(traceback.format_exc())
 
+# --------------------- JSON Serialization ---------------------
+#
+# All API responses and state files go through json_dumps/json_loads. They use
+# orjson when it is installed and the stdlib json module otherwise; both write
+# compact UTF-8 output.
+
+def json_default(o):
+    """
+    Serialize the dashboard's compact state types for either JSON backend.
+    """
+    if isinstance(o, DonationView):
+        return o.to_dicts()
+    if isinstance(o, MappingProxyType):
+        return dict(o)
+    if isinstance(o, array):
+        return o.tolist()
+    if isinstance(o, datetime):
+        return o.isoformat()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+if orjson is not None:
+    JSON_BACKEND = "orjson"
+
+    def json_dumps(obj):
+        """
+        Encode an object as compact UTF-8 JSON bytes.
+        """
+        return orjson.dumps(obj, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+
+    json_loads = orjson.loads
+else:
+    JSON_BACKEND = "json"
+
+    def json_dumps(obj):
+        """
+        Encode an object as compact UTF-8 JSON bytes.
+        """
+        return json.dumps(obj, default=json_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    json_loads = json.loads
+
+def json_load_file(path):
+    """
+    Read and decode a JSON file.
+    """
+    with open(path, 'rb') as f:
+        return json_loads(f.read())
+
+# --------------------- Donation Store ---------------------
+
+EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+def iso_to_epoch_us(date_string):
+    """
+    Convert an ISO 8601 timestamp (naive values are treated as UTC) to epoch microseconds.
+    """
+    moment = datetime.fromisoformat(date_string)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return (moment - EPOCH) // ONE_MICROSECOND
+
+def epoch_us_to_iso(timestamp_us):
+    """
+    Convert epoch microseconds back to a naive UTC ISO 8601 timestamp.
+    """
+    return (EPOCH + timedelta(microseconds=timestamp_us)).isoformat()
+
+def msat_to_sats(amount_msat):
+    """
+    Convert msats to sats, keeping whole amounts as integers.
+    """
+    if amount_msat % 1000 == 0:
+        return amount_msat // 1000
+    return amount_msat / 1000
+
+class DonationStore:
+    """
+    Append-only, column-oriented storage for donations.
+
+    Instead of one dict per donation, timestamps (epoch microseconds) and
+    amounts (msats) live in parallel integer arrays and memos are
+    deduplicated into a shared table. Records are only materialized as dicts
+    when they are read.
+    """
+    __slots__ = ("timestamps", "amounts_msat", "memo_ids", "memos", "_memo_index", "total_msat")
+
+    def __init__(self, items=()):
+        self.timestamps = array('q')
+        self.amounts_msat = array('q')
+        self.memo_ids = array('l')
+        self.memos = []
+        self._memo_index = {}
+        self.total_msat = 0
+        for item in items:
+            self.append(item)
+
+    @classmethod
+    def from_columns(cls, timestamps, memo_ids, amounts_msat, memos):
+        """
+        Build a store directly from its column lists (see `DonationView.columns`).
+        """
+        store = cls()
+        store.timestamps.extend(timestamps)
+        store.memo_ids.extend(memo_ids)
+        store.amounts_msat.extend(amounts_msat)
+        store.memos = list(memos)
+        store._memo_index = {memo: memo_id for memo_id, memo in enumerate(store.memos)}
+        store.total_msat = sum(store.amounts_msat)
+        return store
+
+    def add(self, timestamp_us, memo, amount_msat):
+        """
+        Append a donation given in its compact representation.
+        """
+        memo_id = self._memo_index.get(memo)
+        if memo_id is None:
+            memo_id = len(self.memos)
+            self.memos.append(memo)
+            self._memo_index[memo] = memo_id
+        # Memo and amount columns are appended first; readers bound by the
+        # timestamp length never see a half-written row.
+        self.memo_ids.append(memo_id)
+        self.amounts_msat.append(amount_msat)
+        self.timestamps.append(timestamp_us)
+        self.total_msat += amount_msat
+
+    def append(self, donation):
+        """
+        Append a donation given as a dict with `date`, `memo` and `amount` (sats).
+        """
+        self.add(
+            iso_to_epoch_us(donation["date"]),
+            donation.get("memo", "No Memo"),
+            int(round(float(donation.get("amount", 0)) * 1000))
+        )
+
+    def record(self, index):
+        """
+        Materialize a single donation as a dict.
+        """
+        return {
+            "date": epoch_us_to_iso(self.timestamps[index]),
+            "memo": self.memos[self.memo_ids[index]],
+            "amount": msat_to_sats(self.amounts_msat[index])
+        }
+
+    def view(self, start=0, stop=None):
+        """
+        Return a read-only view over the rows that exist right now.
+        """
+        if stop is None:
+            stop = len(self.timestamps)
+        return DonationView(self, start, stop)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def __getitem__(self, index):
+        return self.view()[index]
+
+    @property
+    def total_sats(self):
+        return msat_to_sats(self.total_msat)
+
+class DonationView:
+    """
+    Read-only, fixed-length window over a DonationStore.
+
+    Because the store is append-only, a view stays consistent while new
+    donations are appended behind it.
+    """
+    __slots__ = ("store", "start", "stop")
+
+    def __init__(self, store, start, stop):
+        self.store = store
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __repr__(self):
+        return f"<DonationView of {len(self)} donations>"
+
+    def __iter__(self):
+        record = self.store.record
+        for index in range(self.start, self.stop):
+            yield record(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return DonationView(self.store, self.start + start, self.start + max(start, stop))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("donation index out of range")
+        return self.store.record(self.start + index)
+
+    def rows(self):
+        """
+        Iterate over compact `(timestamp_us, memo, amount_msat)` tuples without building dicts.
+        """
+        store = self.store
+        memos = store.memos
+        for timestamp_us, memo_id, amount_msat in zip(
+            store.timestamps[self.start:self.stop],
+            store.memo_ids[self.start:self.stop],
+            store.amounts_msat[self.start:self.stop]
+        ):
+            yield timestamp_us, memos[memo_id], amount_msat
+
+    @property
+    def total_msat(self):
+        return sum(self.store.amounts_msat[self.start:self.stop])
+
+    def to_dicts(self):
+        """
+        Materialize all donations of this view as a list of dicts.
+        """
+        return list(self)
+
+    def columns(self):
+        """
+        Return the donations of this view as compact, JSON-serializable column lists.
+        """
+        store = self.store
+        return {
+            "timestamps": store.timestamps[self.start:self.stop].tolist(),
+            "memo_ids": store.memo_ids[self.start:self.stop].tolist(),
+            "amounts_msat": store.amounts_msat[self.start:self.stop].tolist(),
+            "memos": list(store.memos)
+        }
+
 def load_donations():
     """
-    Load donations from the donations file into the donations list and set total donations.
+    Load the hot donations from the donations file into the donation store and set
+    the number and total (msats) of the archived donations.
     """
-    global donations, total_donations
+    global donations, archived_total_msat, archived_count
     if os.path.exists(DONATIONS_FILE):
         try:
-            with open(DONATIONS_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                donations = data.get("donations", [])
-                total_donations = data.get("total_donations", 0)
+            data = json_load_file(DONATIONS_FILE)
+            donations = DonationStore(data.get("donations", []))
+            if "archived_total_msat" in data:
+                archived_total_msat = int(data["archived_total_msat"])
+            else:
+                # Files written by older versions only hold the total in sats
+                archived_total_msat = int(round(float(data.get("total_donations", 0)) * 1000)) - donations.total_msat
+            archived_count = data.get("archived_count", 0)
             logger.debug(f"Loaded {len(donations)} donations from the file.")
         except Exception as e:
             logger.error(f"Error loading donations: {e}")
             logger.debug(traceback.format_exc())
 
+# Serializes writes of the donations file
+donations_save_lock = threading.Lock()
+
 def save_donations():
     """
-    Save donations to the donations file.
+    Save the current state snapshot's donations to the donations file.
+
+    Writers don't hold donations_lock; the snapshot is read under
+    donations_save_lock, so the file always ends up with the newest state.
     """
     try:
-        with open(DONATIONS_FILE, 'w', encoding='utf-8') as f:
-            json.dump({
-                "total_donations": total_donations,
-                "donations": donations
-            }, f, ensure_ascii=False, indent=4)
+        with donations_save_lock:
+            snapshot = current_state
+            write_file_atomic(DONATIONS_FILE, json_dumps({
+                "total_donations": snapshot.total_donations,
+                "archived_total_msat": snapshot.archived_total_msat,
+                "archived_count": snapshot.archived_count,
+                "donations": snapshot.donations
+            }))
+            save_memo_index()
         logger.debug("Successfully saved donations data.")
     except Exception as e:
         logger.error(f"Error saving donations: {e}")
         logger.debug(traceback.format_exc())
 
+# --------------------- Donation Archive ---------------------
+#
+# Donations from months that lie entirely before the last DONATION_HOT_DAYS are
+# moved out of memory into gzip-compressed monthly segments in
+# DONATION_ARCHIVE_DIR. Segments are only read for history and export requests;
+# total_donations always covers hot and archived donations (archived_total_msat
+# keeps the archived part as an exact integer).
+
+ARCHIVE_NAME_PATTERN = re.compile(r"donations-(\d{4}-\d{2})\.json\.gz")
+
+# Serializes changes to the hot donation set (ingestion and archiving)
+donations_lock = threading.Lock()
+
+def archive_path(month):
+    """
+    Return the path of the archive segment for a month (YYYY-MM).
+    """
+    return os.path.join(DONATION_ARCHIVE_DIR, f"donations-{month}.json.gz")
+
+def archive_months():
+    """
+    List the months (YYYY-MM) that have an archive segment, oldest first.
+    """
+    try:
+        names = os.listdir(DONATION_ARCHIVE_DIR)
+    except FileNotFoundError:
+        return []
+    return sorted(match.group(1) for match in map(ARCHIVE_NAME_PATTERN.fullmatch, names) if match)
+
+def load_archive_month(month):
+    """
+    Load the donations of one archive segment, oldest first.
+    """
+    with gzip.open(archive_path(month), 'rb') as f:
+        return json_loads(f.read())["donations"]
+
+def iter_archived_donations(start=None, end=None, months=None):
+    """
+    Yield archived donations oldest first, reading only the segments that
+    overlap the optional [start, end) range of naive UTC datetimes.
+
+    Parameters:
+        months (list, optional): The archive months to read. Defaults to all of them.
+    """
+    for month in (months if months is not None else archive_months()):
+        if start is not None and month < start.strftime("%Y-%m"):
+            continue
+        if end is not None and month > end.strftime("%Y-%m"):
+            break
+        for donation in load_archive_month(month):
+            if start is not None or end is not None:
+                date = datetime.fromisoformat(donation["date"])
+                if (start is not None and date < start) or (end is not None and date >= end):
+                    continue
+            yield donation
+
+def archive_old_donations(now=None):
+    """
+    Move donations from months that ended before the hot window into their
+    compressed monthly archive segments.
+
+    Returns:
+        int: The number of donations that were archived.
+    """
+    global donations, archived_count, archived_total_msat
+    if DONATION_HOT_DAYS <= 0:
+        return 0
+    cutoff = (now or datetime.utcnow()) - timedelta(days=DONATION_HOT_DAYS)
+    cutoff_us = (cutoff.replace(day=1, hour=0, minute=0, second=0, microsecond=0) - EPOCH) // ONE_MICROSECOND
+
+    with donations_lock:
+        by_month = {}
+        hot = DonationStore()
+        for timestamp_us, memo, amount_msat in donations.view().rows():
+            if timestamp_us < cutoff_us:
+                date = epoch_us_to_iso(timestamp_us)
+                by_month.setdefault(date[:7], []).append({
+                    "date": date,
+                    "memo": memo,
+                    "amount": msat_to_sats(amount_msat)
+                })
+            else:
+                hot.add(timestamp_us, memo, amount_msat)
+        if not by_month:
+            return 0
+
+        try:
+            os.makedirs(DONATION_ARCHIVE_DIR, exist_ok=True)
+            for month, items in sorted(by_month.items()):
+                if os.path.exists(archive_path(month)):
+                    # Merge with an existing segment, skipping rows already archived by an interrupted run
+                    existing = load_archive_month(month)
+                    seen = {(d["date"], d["memo"], d["amount"]) for d in existing}
+                    items = existing + [d for d in items if (d["date"], d["memo"], d["amount"]) not in seen]
+                    items.sort(key=lambda d: d["date"])
+                write_file_atomic(archive_path(month), gzip.compress(json_dumps({
+                    "month": month,
+                    "donations": items
+                }), mtime=0))
+        except Exception as e:
+            logger.error(f"Error archiving donations: {e}")
+            logger.debug(traceback.format_exc())
+            return 0
+
+        moved = len(donations) - len(hot)
+        archived_total_msat += donations.total_msat - hot.total_msat
+        donations = hot
+        archived_count += moved
+        publish_state(
+            donations=donations,
+            archived_count=archived_count,
+            archived_total_msat=archived_total_msat,
+            archive_months=archive_months(),
+            last_update=datetime.utcnow()
+        )
+    save_donations()
+    logger.info("Archived %d donations from %d month(s).", moved, len(by_month))
+    return moved
+
+# --------------------- Memo Search ---------------------
+#
+# An inverted index from memo tokens to donation ordinals. Ordinals number the
+# whole history oldest first: archived donations (0 .. archived_count - 1), then
+# the hot donations. Archiving keeps them stable, so the index only ever grows.
+# Tokens come from sanitized memos, case- and accent-folded; a sorted token list
+# answers prefix queries. The index is caught up from the current snapshot
+# before searching. It is persisted incrementally: DONATION_INDEX_FILE holds a
+# compacted index, and each save of the donations appends only the new postings
+# to DONATION_INDEX_LOG. The compacted file is rewritten once the log covers as
+# many donations as the file itself, so saving costs stay proportional to new
+# donations.
+
+# Donations the log may cover before it is compacted, at least
+MEMO_INDEX_COMPACT_MIN = 10000
+
+MEMO_TOKEN_PATTERN = re.compile(r"\w+")
+
+def fold_text(text):
+    """
+    Lowercase text and strip accents so "Öma" matches "oma".
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+def memo_tokens(memo):
+    """
+    Return the searchable tokens of a memo, without forbidden words.
+    """
+    if not memo:
+        return set()
+    if not isinstance(memo, str):
+        memo = str(memo)
+    if FORBIDDEN_WORDS:
+        # Same matching as sanitize_memo; masked words are simply not indexed
+        memo = forbidden_words_pattern(frozenset(FORBIDDEN_WORDS)).sub(" ", memo)
+    return set(MEMO_TOKEN_PATTERN.findall(fold_text(memo)))
+
+@lru_cache(maxsize=12)
+def load_archive_segment(month, mtime_ns):
+    """
+    Load an archive segment, cached per file version.
+    """
+    return load_archive_month(month)
+
+# Number of donations per archive segment version, (month, mtime_ns) -> count
+archive_segment_counts = {}
+
+def archive_segments(months):
+    """
+    List the archive segments of the given months as (first ordinal, month,
+    mtime_ns), oldest first.
+    """
+    segments = []
+    ordinal = 0
+    for month in months:
+        mtime_ns = os.stat(archive_path(month)).st_mtime_ns
+        segments.append((ordinal, month, mtime_ns))
+        count = archive_segment_counts.get((month, mtime_ns))
+        if count is None:
+            count = archive_segment_counts[(month, mtime_ns)] = len(load_archive_segment(month, mtime_ns))
+        ordinal += count
+    return segments
+
+def donation_at(ordinal, snapshot, segments=None):
+    """
+    Return the donation with the given ordinal from the hot set or the archive.
+    """
+    if ordinal >= snapshot.archived_count:
+        return snapshot.donations[ordinal - snapshot.archived_count]
+    segments = segments if segments is not None else archive_segments(snapshot.archive_months)
+    first, month, mtime_ns = segments[bisect.bisect_right(segments, (ordinal, "\uffff")) - 1]
+    return load_archive_segment(month, mtime_ns)[ordinal - first]
+
+class MemoIndex:
+    """
+    Inverted index from memo tokens to ascending donation ordinals.
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        self.postings = {}
+        self.tokens = []  # Sorted, for prefix lookups
+        self.new_tokens = []  # Not merged into `tokens` yet
+        self.count = 0  # Number of donations indexed
+        self.signature = self.forbidden_words_signature()
+        self.pending = {}  # Postings added since the last save, token -> ordinals
+        self.saved_count = 0  # Donations covered by the index files
+        self.base_count = 0  # Donations covered by DONATION_INDEX_FILE
+        self.needs_rewrite = True  # The files do not describe this index (e.g. after a rebuild)
+
+    @staticmethod
+    def forbidden_words_signature():
+        return hashlib.sha256("\n".join(sorted(FORBIDDEN_WORDS)).encode('utf-8')).hexdigest()[:16]
+
+    def add(self, memo, tokens_cache=None):
+        """
+        Index the memo of the next donation (ordinal `count`).
+        """
+        if tokens_cache is not None:
+            tokens = tokens_cache.get(memo)
+            if tokens is None:
+                tokens = tokens_cache[memo] = memo_tokens(memo)
+        else:
+            tokens = memo_tokens(memo)
+        for token in tokens:
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = array('q')
+                self.new_tokens.append(token)
+            posting.append(self.count)
+            self.pending.setdefault(token, []).append(self.count)
+        self.count += 1
+
+    def catch_up(self, snapshot):
+        """
+        Index all donations of the snapshot that are not indexed yet.
+
+        Returns:
+            int: The number of donations added.
+        """
+        with self.lock:
+            total = snapshot.archived_count + snapshot.donation_count
+            if self.count > total or self.signature != self.forbidden_words_signature():
+                logger.info("Memo index does not match the donation history. Rebuilding.")
+                self.reset()
+            before = self.count
+            tokens_cache = {}
+            if self.count < snapshot.archived_count:
+                for first, month, mtime_ns in archive_segments(snapshot.archive_months):
+                    segment = load_archive_segment(month, mtime_ns)
+                    for donation in segment[max(0, self.count - first):]:
+                        self.add(donation["memo"], tokens_cache)
+            hot_start = self.count - snapshot.archived_count
+            for _, memo, _ in snapshot.donations[hot_start:].rows():
+                self.add(memo, tokens_cache)
+            if self.count > before:
+                logger.debug("Indexed %d donation memos.", self.count - before)
+            return self.count - before
+
+    def search(self, query):
+        """
+        Find donations whose memo contains a token starting with every word of the query.
+
+        Returns:
+            list: Matching ordinals, newest first.
+        """
+        words = set(MEMO_TOKEN_PATTERN.findall(fold_text(query)))
+        if not words:
+            return []
+        with self.lock:
+            if self.new_tokens:
+                # Timsort merges the sorted list and the short unsorted tail in about linear time
+                self.tokens.extend(self.new_tokens)
+                self.tokens.sort()
+                self.new_tokens = []
+            matches = None
+            for word in sorted(words, key=len, reverse=True):  # Longer prefixes are more selective
+                ordinals = set()
+                position = bisect.bisect_left(self.tokens, word)
+                while position < len(self.tokens) and self.tokens[position].startswith(word):
+                    ordinals.update(self.postings[self.tokens[position]])
+                    position += 1
+                matches = ordinals if matches is None else matches & ordinals
+                if not matches:
+                    return []
+        return sorted(matches, reverse=True)
+
+    def to_json(self):
+        """
+        Serialize the index with delta-encoded postings.
+        """
+        with self.lock:
+            return json_dumps({
+                "signature": self.signature,
+                "count": self.count,
+                "postings": {
+                    token: [ordinal - previous for ordinal, previous in zip(posting, [0] + posting.tolist())]
+                    for token, posting in self.postings.items()
+                }
+            })
+
+    def load(self, data):
+        """
+        Restore the index from the output of to_json.
+        """
+        with self.lock:
+            self.reset()
+            if data.get("signature") != self.signature:
+                return
+            for token, deltas in data["postings"].items():
+                posting = array('q')
+                ordinal = 0
+                for delta in deltas:
+                    ordinal += delta
+                    posting.append(ordinal)
+                self.postings[token] = posting
+            self.tokens = sorted(self.postings)
+            self.count = self.saved_count = self.base_count = data["count"]
+            self.needs_rewrite = False
+
+    def delta_json(self):
+        """
+        Serialize the postings added since the last save as one log line.
+        """
+        with self.lock:
+            return json_dumps({
+                "signature": self.signature,
+                "first": self.saved_count,
+                "count": self.count,
+                "postings": self.pending
+            }) + b"\n"
+
+    def apply_delta(self, data):
+        """
+        Replay a log line written by delta_json.
+
+        Raises:
+            ValueError: If the line does not continue this index.
+        """
+        with self.lock:
+            if data["signature"] != self.signature:
+                raise ValueError("memo index log was written with other forbidden words")
+            if data["count"] <= self.count:
+                return  # Already part of the compacted file
+            if data["first"] != self.count:
+                raise ValueError("memo index log has a gap")
+            for token, ordinals in data["postings"].items():
+                posting = self.postings.get(token)
+                if posting is None:
+                    posting = self.postings[token] = array('q')
+                    self.new_tokens.append(token)
+                posting.extend(ordinals)
+            self.count = self.saved_count = data["count"]
+
+    def mark_saved(self, compacted=False):
+        with self.lock:
+            self.pending = {}
+            self.saved_count = self.count
+            if compacted:
+                self.base_count = self.count
+                self.needs_rewrite = False
+
+def load_memo_index():
+    """
+    Load the persisted memo index and replay its log, if there is one.
+    """
+    if not os.path.exists(DONATION_INDEX_FILE):
+        return
+    try:
+        memo_index.load(json_load_file(DONATION_INDEX_FILE))
+        if os.path.exists(DONATION_INDEX_LOG):
+            with open(DONATION_INDEX_LOG, 'rb') as f:
+                for line in f:
+                    memo_index.apply_delta(json_loads(line))
+        logger.debug("Loaded memo index covering %d donations.", memo_index.count)
+    except Exception as e:
+        # Whatever was loaded is consistent; catch_up() adds the rest
+        logger.error(f"Error loading memo index: {e}")
+        logger.debug(traceback.format_exc())
+        memo_index.needs_rewrite = True
+
+def save_memo_index():
+    """
+    Append the new memo index entries to DONATION_INDEX_LOG, or rewrite the
+    compacted DONATION_INDEX_FILE after a rebuild or once the log has grown
+    as large as it.
+    """
+    try:
+        with memo_index.lock:
+            logged = memo_index.count - memo_index.base_count
+            if memo_index.needs_rewrite or logged >= max(MEMO_INDEX_COMPACT_MIN, memo_index.base_count):
+                write_file_atomic(DONATION_INDEX_FILE, memo_index.to_json())
+                if os.path.exists(DONATION_INDEX_LOG):
+                    os.remove(DONATION_INDEX_LOG)
+                memo_index.mark_saved(compacted=True)
+            elif memo_index.count > memo_index.saved_count:
+                with open(DONATION_INDEX_LOG, 'ab') as f:
+                    f.write(memo_index.delta_json())
+                memo_index.mark_saved()
+    except Exception as e:
+        logger.error(f"Error saving memo index: {e}")
+        logger.debug(traceback.format_exc())
+
+# --------------------- Balance History ---------------------
+#
+# Every balance observation is appended to BALANCE_HISTORY_FILE as a fixed-width
+# record of two little-endian signed 64-bit integers: epoch microseconds and the
+# balance in msat. Readers memory-map the file and binary-search the time range,
+# so a chart request never parses more than the records it returns.
+
+BALANCE_RECORD = struct.Struct("<qq")
+
+balance_history_lock = threading.Lock()
+
+def record_balance(balance_msat, moment=None):
+    """
+    Append a balance observation to the balance history.
+
+    Parameters:
+        balance_msat (int): The wallet balance in msats.
+        moment (datetime, optional): Naive UTC time of the observation, defaults to now.
+    """
+    try:
+        with balance_history_lock, open(BALANCE_HISTORY_FILE, 'ab') as f:
+            # Taken under the lock, so concurrent writers append in time order
+            timestamp_us = ((moment or datetime.utcnow()) - EPOCH) // ONE_MICROSECOND
+            f.write(BALANCE_RECORD.pack(timestamp_us, int(balance_msat)))
+    except Exception as e:
+        logger.error(f"Error recording balance history: {e}")
+        logger.debug(traceback.format_exc())
+
+def read_balance_history(start_us=None, end_us=None):
+    """
+    Read the balance observations within [start_us, end_us).
+
+    Returns:
+        tuple: Two arrays ('q') with the timestamps (epoch µs) and balances (msat), oldest first.
+    """
+    timestamps, balances = array('q'), array('q')
+    try:
+        with open(BALANCE_HISTORY_FILE, 'rb') as f:
+            # Ignore a trailing partial record from a concurrent append
+            count = os.fstat(f.fileno()).st_size // BALANCE_RECORD.size
+            if count == 0:
+                return timestamps, balances
+            with mmap.mmap(f.fileno(), count * BALANCE_RECORD.size, access=mmap.ACCESS_READ) as data:
+                def timestamp_at(index):
+                    return BALANCE_RECORD.unpack_from(data, index * BALANCE_RECORD.size)[0]
+
+                def lower_bound(value):
+                    low, high = 0, count
+                    while low < high:
+                        middle = (low + high) // 2
+                        if timestamp_at(middle) < value:
+                            low = middle + 1
+                        else:
+                            high = middle
+                    return low
+
+                first = 0 if start_us is None else lower_bound(start_us)
+                last = count if end_us is None else lower_bound(end_us)
+                if first >= last:
+                    return timestamps, balances
+                records = array('q', data[first * BALANCE_RECORD.size:last * BALANCE_RECORD.size])
+    except FileNotFoundError:
+        return timestamps, balances
+    if sys.byteorder != "little":
+        records.byteswap()
+    return records[0::2], records[1::2]
+
+def downsample_lttb(timestamps, values, threshold):
+    """
+    Reduce a series to `threshold` points with Largest-Triangle-Three-Buckets,
+    which keeps the visual shape (peaks, drops) of the curve.
+
+    Returns:
+        list: The indices of the selected points.
+    """
+    count = len(timestamps)
+    if threshold >= count:
+        return list(range(count))
+    if threshold < 3:
+        # No bucket in between: only the end points (or just the first) remain
+        return [0, count - 1][:max(threshold, 1)]
+
+    selected = [0]
+    bucket_size = (count - 2) / (threshold - 2)
+    previous = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+
+        # Average of the next bucket is the third corner of the triangle
+        next_start, next_end = end, min(int((bucket + 2) * bucket_size) + 1, count)
+        next_size = next_end - next_start
+        average_x = sum(timestamps[next_start:next_end]) / next_size
+        average_y = sum(values[next_start:next_end]) / next_size
+
+        previous_x, previous_y = timestamps[previous], values[previous]
+        best, best_area = start, -1
+        for index in range(start, end):
+            area = abs(
+                (previous_x - average_x) * (values[index] - previous_y)
+                - (previous_x - timestamps[index]) * (average_y - previous_y)
+            )
+            if area > best_area:
+                best, best_area = index, area
+        selected.append(best)
+        previous = best
+    selected.append(count - 1)
+    return selected
+
+def downsample_minmax(timestamps, values, threshold):
+    """
+    Reduce a series to at most `threshold` points by keeping the minimum and
+    maximum of each time bucket, so no extreme value is lost.
+
+    Returns:
+        list: The indices of the selected points.
+    """
+    count = len(timestamps)
+    if threshold >= count or threshold < 2:
+        return list(range(count))
+
+    buckets = threshold // 2
+    bucket_size = count / buckets
+    selected = []
+    for bucket in range(buckets):
+        start = int(bucket * bucket_size)
+        end = int((bucket + 1) * bucket_size)
+        window = range(start, end)
+        low = min(window, key=values.__getitem__)
+        high = max(window, key=values.__getitem__)
+        selected.extend(sorted({low, high}))
+    return selected
+
+DOWNSAMPLERS = {
+    "lttb": downsample_lttb,
+    "minmax": downsample_minmax
+}
+
 # Initialize the set of processed payments
 processed_payments = load_processed_payments()
 
+class DashboardJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that serializes responses with the configured JSON backend
+    and understands the dashboard's compact state types.
+    """
+    def dumps(self, obj, **kwargs):
+        return json_dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return json_loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(json_dumps(obj), mimetype=self.mimetype)
+
 # Initialize the Flask app
 app = Flask(__name__)
+app.json = DashboardJSONProvider(app)
 
-# Global variables to store the latest data
-latest_balance = {
-    "balance_sats": None,
-    "last_change": None,
-    "memo": None
-}
+# Writer-side state, only mutated by the ingestion path (scheduler thread).
+# A ring buffer of the most recent payment records, oldest first.
+latest_payments = deque(maxlen=RECENT_PAYMENTS_CAPACITY)
+
+# Data structures for donations (the hot, in-memory part of the history)
+donations = DonationStore()
+archived_total_msat = 0
+archived_count = 0
 
-latest_payments = []
+# --------------------- State Snapshots ---------------------
 
-# Data structures for donations
-donations = []
-total_donations = 0
+@dataclass(frozen=True)
+class StateSnapshot:
+    """
+    Immutable view of the dashboard state.
+
+    The ingestion path publishes a new snapshot after each batch. Readers grab
+    `current_state` once and get a consistent view without taking any lock.
+    """
+    version: int
+    donations: DonationView
+    total_donations: float
+    donation_count: int
+    latest_donation: dict
+    last_update: datetime
+    latest_balance: MappingProxyType
+    latest_payments: tuple
+    pay_link: MappingProxyType = None
+    archived_count: int = 0
+    archived_total_msat: int = 0
+    archive_months: tuple = ()
+
+# Serializes writers; readers never take it
+state_lock = threading.Lock()
+
+current_state = StateSnapshot(
+    version=0,
+    donations=DonationStore().view(),
+    total_donations=0,
+    donation_count=0,
+    latest_donation=None,
+    last_update=datetime.utcnow(),
+    latest_balance=MappingProxyType({
+        "balance_sats": None,
+        "last_change": None,
+        "memo": None
+    }),
+    latest_payments=()
+)
+
+def publish_state(**changes):
+    """
+    Atomically publish a new state snapshot derived from the current one.
+
+    Parameters:
+        **changes: Snapshot fields to replace. `donations` takes the DonationStore;
+            derived fields (donation count, latest donation, and with
+            `archived_total_msat` the total donations) are recomputed from it.
+
+    Returns:
+        StateSnapshot: The newly published snapshot.
+    """
+    global current_state
+    if "donations" in changes:
+        # The store keeps its total as an integer, so the sats total needs no summing
+        archived_msat = changes.get("archived_total_msat", current_state.archived_total_msat)
+        changes["total_donations"] = msat_to_sats(archived_msat + changes["donations"].total_msat)
+        # A view over the append-only store is O(1) to take and never changes
+        frozen_donations = changes["donations"].view()
+        changes["donations"] = frozen_donations
+        changes["donation_count"] = len(frozen_donations)
+        changes["latest_donation"] = frozen_donations[-1] if frozen_donations else None
+    if "latest_balance" in changes:
+        changes["latest_balance"] = MappingProxyType(dict(changes["latest_balance"]))
+    if "latest_payments" in changes:
+        changes["latest_payments"] = tuple(changes["latest_payments"])
+    if "archive_months" in changes:
+        changes["archive_months"] = tuple(changes["archive_months"])
+    if changes.get("pay_link") is not None:
+        changes["pay_link"] = MappingProxyType(dict(changes["pay_link"]))
+    with state_lock:
+        snapshot = replace(current_state, version=current_state.version + 1, **changes)
+        current_state = snapshot
+        if PROCESS_ROLE == "poller":
+            write_state_snapshot(snapshot)
+    logger.debug("Published state snapshot version %s.", snapshot.version)
+    return snapshot
+
+# --------------------- Shared Snapshot File ---------------------
+#
+# In split deployments the poller writes every published snapshot to
+# STATE_SNAPSHOT_FILE (atomic rename), and dashboard processes reload it when
+# the file changes. Dashboard processes never poll LNbits themselves.
+
+# (mtime, size) of the snapshot file the dashboard has loaded
+loaded_snapshot_stamp = None
+snapshot_reload_lock = threading.Lock()
+
+def write_state_snapshot(snapshot):
+    """
+    Write a state snapshot to STATE_SNAPSHOT_FILE.
+    """
+    try:
+        write_file_atomic(STATE_SNAPSHOT_FILE, json_dumps({
+            "version": snapshot.version,
+            "last_update": snapshot.last_update.isoformat(),
+            "total_donations": snapshot.total_donations,
+            "latest_balance": dict(snapshot.latest_balance),
+            "latest_payments": list(snapshot.latest_payments),
+            "pay_link": dict(snapshot.pay_link) if snapshot.pay_link is not None else None,
+            "archived_count": snapshot.archived_count,
+            "archived_total_msat": snapshot.archived_total_msat,
+            "archive_months": list(snapshot.archive_months),
+            "donations": snapshot.donations.columns()
+        }))
+    except Exception as e:
+        logger.error(f"Error writing state snapshot: {e}")
+        logger.debug(traceback.format_exc())
 
-# Global variable to track the last update time
-last_update = datetime.utcnow()
+def reload_state_snapshot():
+    """
+    Reload STATE_SNAPSHOT_FILE if it changed since it was last loaded.
 
-# Load existing donations at startup
-load_donations()
+    Returns:
+        bool: True if a new snapshot was loaded.
+    """
+    global current_state, loaded_snapshot_stamp
+    try:
+        stat = os.stat(STATE_SNAPSHOT_FILE)
+    except FileNotFoundError:
+        return False
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    if stamp == loaded_snapshot_stamp:
+        return False
+    if not snapshot_reload_lock.acquire(blocking=False):
+        return False  # Another thread is already reloading
+    try:
+        data = json_load_file(STATE_SNAPSHOT_FILE)
+        columns = data["donations"]
+        store = DonationStore.from_columns(
+            columns["timestamps"], columns["memo_ids"], columns["amounts_msat"], columns["memos"]
+        )
+        view = store.view()
+        current_state = StateSnapshot(
+            version=data["version"],
+            donations=view,
+            total_donations=data["total_donations"],
+            donation_count=len(view),
+            latest_donation=view[-1] if view else None,
+            last_update=datetime.fromisoformat(data["last_update"]),
+            latest_balance=MappingProxyType(data["latest_balance"]),
+            latest_payments=tuple(
+                # Snapshots written by older versions only hold payment hashes
+                payment if isinstance(payment, dict) else {"payment_hash": payment}
+                for payment in data["latest_payments"]
+            ),
+            pay_link=MappingProxyType(data["pay_link"]) if data.get("pay_link") else None,
+            archived_count=data.get("archived_count", 0),
+            archived_total_msat=data.get("archived_total_msat", 0),
+            archive_months=tuple(data["archive_months"] if "archive_months" in data else archive_months())
+        )
+        loaded_snapshot_stamp = stamp
+        logger.debug("Loaded state snapshot version %s.", current_state.version)
+        return True
+    except Exception as e:
+        logger.error(f"Error loading state snapshot: {e}")
+        logger.debug(traceback.format_exc())
+        return False
+    finally:
+        snapshot_reload_lock.release()
 
 # Load forbidden words at startup
 FORBIDDEN_WORDS = load_forbidden_words(FORBIDDEN_WORDS_FILE)
 
+# Memo search index, starting from the persisted one
+memo_index = MemoIndex()
+load_memo_index()
+
+# Load existing state at startup
+if PROCESS_ROLE == "dashboard":
+    reload_state_snapshot()
+    memo_index.catch_up(current_state)
+else:
+    load_donations()
+    publish_state(
+        donations=donations,
+        archived_count=archived_count,
+        archived_total_msat=archived_total_msat,
+        archive_months=archive_months()
+    )
+    archive_old_donations()
+    if memo_index.catch_up(current_state):
+        save_memo_index()
+
+# --------------------- Notification Fan-out ---------------------
+#
+# Notifications are rendered once and delivered to every subscriber that wants
+# the kind concurrently. Each chat has its own rate limit, so a slow or failing
+# chat never delays or breaks delivery to the others.
+
+class ChatRateLimiter:
+    """
+    Serializes sends to one chat and keeps them at least `min_interval` seconds apart.
+    """
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.next_send = 0.0
+
+    def __enter__(self):
+        self.lock.acquire()
+        delay = self.next_send - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        return self
+
+    def __exit__(self, *exc_info):
+        # Keep a longer delay requested via back_off() during this send
+        self.next_send = max(self.next_send, time.monotonic() + self.min_interval)
+        self.lock.release()
+
+    def back_off(self, seconds):
+        """
+        Delay the next send, e.g. after Telegram answered with "retry after".
+        """
+        self.next_send = max(self.next_send, time.monotonic() + seconds)
+
+chat_limiters = {chat_id: ChatRateLimiter(TELEGRAM_CHAT_MIN_INTERVAL) for chat_id in SUBSCRIBERS}
+notification_executor = ThreadPoolExecutor(max_workers=TELEGRAM_FANOUT_WORKERS, thread_name_prefix="notify")
+
+def send_to_chat(chat_id, text, **kwargs):
+    """
+    Send a message to one chat within its rate limit, retrying once when Telegram asks to slow down.
+
+    Returns:
+        bool: True if the message was delivered.
+    """
+    limiter = chat_limiters[chat_id]
+    for attempt in range(2):
+        with limiter:
+            try:
+                bot.send_message(chat_id=chat_id, text=text, **kwargs)
+                return True
+            except RetryAfter as e:
+                logger.warning(f"Telegram rate limit for chat {chat_id}, retrying after {e.retry_after} seconds.")
+                limiter.back_off(e.retry_after)
+            except Exception as e:
+                logger.error(f"Error sending message to chat {chat_id}: {e}")
+                logger.debug(traceback.format_exc())
+                return False
+    return False
+
+def notification_chats(kind, live=False):
+    """
+    Return the subscribers of a notification kind.
+
+    Parameters:
+        kind (str): One of NOTIFICATION_KINDS.
+        live (bool): Select the chats that follow the kind in their live status
+            message instead of the chats that get it as messages of their own.
+    """
+    return [
+        chat_id for chat_id, kinds in SUBSCRIBERS.items()
+        if kind in kinds and (TELEGRAM_LIVE_STATUS and "live" in kinds) == live
+    ]
+
+def notify_subscribers(kind, text, live=False, **kwargs):
+    """
+    Deliver a rendered notification to all subscribers of its kind concurrently.
+
+    Parameters:
+        kind (str): One of NOTIFICATION_KINDS.
+        text (str): The rendered message.
+        live (bool): Deliver to the chats with a live status message (e.g. for
+            highlights) instead of the others; see notification_chats.
+        **kwargs: Further arguments for bot.send_message (parse_mode, reply_markup, ...).
+
+    Returns:
+        bool: True if at least one subscriber received it, or nobody subscribed to the kind.
+    """
+    chat_ids = notification_chats(kind, live)
+    if not chat_ids:
+        logger.debug("No subscribers for %s notifications.", kind)
+        return True
+    futures = [notification_executor.submit(send_to_chat, chat_id, text, **kwargs) for chat_id in chat_ids]
+    delivered = sum(future.result() for future in futures)
+    logger.info("Delivered %s notification to %d of %d chat(s).", kind, delivered, len(chat_ids))
+    return delivered > 0
+
+# --------------------- Live Status ---------------------
+#
+# With TELEGRAM_LIVE_STATUS every subscriber chat gets one pinned message that
+# is edited in place (balance, today's in/out, latest donations) instead of a
+# new message per poll, balance change and daily report. Updates requested in
+# quick succession are coalesced into one edit per TELEGRAM_LIVE_STATUS_INTERVAL.
+
+LIVE_STATUS_DONATION_COUNT = 5
+
+def live_status_keyboard():
+    keyboard = []
+    if DONATIONS_URL:
+        keyboard.append([InlineKeyboardButton("🐽 Show Piggy Bank", url=DONATIONS_URL)])
+    keyboard.append([InlineKeyboardButton("🧮 Show Transactions", callback_data='view_transactions')])
+    return InlineKeyboardMarkup(keyboard)
+
+def render_live_status():
+    """
+    Render the live status message from the current state and the payment ledger.
+    """
+    snapshot = current_state
+    now = datetime.utcnow()
+    message_lines = [f"📌 *{INSTANCE_NAME}* - *Live Status*\n"]
+
+    balance_sats = snapshot.latest_balance["balance_sats"]
+    if balance_sats is None:
+        balance_sats = load_last_balance()
+    if balance_sats is not None:
+        message_lines.append(f"🔹 *Balance:* `{int(balance_sats):,} sats`")
+    try:
+        day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        totals = ledger_totals(since_us=(day_start - EPOCH) // ONE_MICROSECOND)
+        message_lines.append(
+            f"🟢 *Today In:* `{totals['incoming'][1] // 1000:,} sats` over `{totals['incoming'][0]}` transactions"
+        )
+        message_lines.append(
+            f"🔴 *Today Out:* `{totals['outgoing'][1] // 1000:,} sats` over `{totals['outgoing'][0]}` transactions"
+        )
+    except Exception as e:
+        logger.error(f"Error reading today's totals from the ledger: {e}")
+        logger.debug(traceback.format_exc())
+
+    latest_donations = snapshot.donations[-LIVE_STATUS_DONATION_COUNT:].to_dicts()
+    if latest_donations:
+        message_lines.append("\n🐷 *Latest Donations:*")
+        for idx, donation in enumerate(reversed(latest_donations), 1):
+            sanitized_memo = sanitize_memo(donation["memo"], FORBIDDEN_WORDS)
+            message_lines.append(f"{idx}. `{donation['amount']:,} sats` – {sanitized_memo}")
+
+    message_lines.append(f"\n🕒 *Updated:* {now.strftime('%Y-%m-%d %H:%M:%S')} UTC")
+    return "\n".join(message_lines)
+
+class LiveStatus:
+    """
+    Keeps one pinned, edited-in-place status message per subscriber chat.
+
+    `request_update()` is cheap and may be called from any job; a background
+    thread renders the message at most once per `min_interval` seconds.
+    """
+    def __init__(self, path, min_interval):
+        self.path = path
+        self.min_interval = min_interval
+        self.message_ids = {}
+        self.wake = threading.Event()
+        self.thread = None
+        self.thread_lock = threading.Lock()
+        self.last_update = float("-inf")
+
+    def load(self):
+        """
+        Load the ids of the pinned messages from the last run.
+        """
+        if not os.path.exists(self.path):
+            return
+        try:
+            self.message_ids = {int(chat_id): message_id for chat_id, message_id in json_load_file(self.path).items()}
+        except Exception as e:
+            logger.error(f"Error loading live status message ids: {e}")
+            logger.debug(traceback.format_exc())
+
+    def save(self):
+        try:
+            write_file_atomic(self.path, json_dumps({str(chat_id): message_id for chat_id, message_id in self.message_ids.items()}))
+        except Exception as e:
+            logger.error(f"Error saving live status message ids: {e}")
+            logger.debug(traceback.format_exc())
+
+    def request_update(self):
+        """
+        Schedule an edit of the live status messages.
+        """
+        with self.thread_lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="live-status", daemon=True)
+                self.thread.start()
+        self.wake.set()
+
+    def run(self):
+        while True:
+            self.wake.wait()
+            delay = self.last_update + self.min_interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            # Requests arriving from here on trigger the next round
+            self.wake.clear()
+            try:
+                self.update()
+            except Exception as e:
+                logger.error(f"Error updating the live status: {e}")
+                logger.debug(traceback.format_exc())
+            self.last_update = time.monotonic()
+
+    def update(self):
+        """
+        Render the status once and edit (or create and pin) the message in every subscriber chat.
+        """
+        text = render_live_status()
+        futures = {
+            chat_id: notification_executor.submit(self.update_chat, chat_id, text)
+            for chat_id, kinds in SUBSCRIBERS.items() if "live" in kinds
+        }
+        changed = False
+        for chat_id, future in futures.items():
+            message_id = future.result()
+            if message_id is not None and message_id != self.message_ids.get(chat_id):
+                self.message_ids[chat_id] = message_id
+                changed = True
+        if changed:
+            self.save()
+        logger.info("Live status updated in %d chat(s).", len(futures))
+
+    def update_chat(self, chat_id, text):
+        """
+        Edit the live status message of one chat, or send and pin a new one.
+
+        Returns:
+            int: The id of the chat's live status message, or None on failure.
+        """
+        limiter = chat_limiters[chat_id]
+        message_id = self.message_ids.get(chat_id)
+        for attempt in range(2):
+            with limiter:
+                try:
+                    if message_id is not None:
+                        bot.edit_message_text(
+                            text=text, chat_id=chat_id, message_id=message_id,
+                            parse_mode=ParseMode.MARKDOWN, disable_web_page_preview=True,
+                            reply_markup=live_status_keyboard()
+                        )
+                        return message_id
+                    message = bot.send_message(
+                        chat_id=chat_id, text=text, parse_mode=ParseMode.MARKDOWN,
+                        disable_web_page_preview=True, reply_markup=live_status_keyboard()
+                    )
+                except RetryAfter as e:
+                    logger.warning(f"Telegram rate limit for chat {chat_id}, retrying after {e.retry_after} seconds.")
+                    limiter.back_off(e.retry_after)
+                    continue
+                except BadRequest as e:
+                    if "not modified" in str(e).lower():
+                        return message_id
+                    # The message was deleted or can no longer be edited: start a new one
+                    logger.warning(f"Cannot edit live status in chat {chat_id} ({e}), sending a new message.")
+                    message_id = None
+                    continue
+                except Exception as e:
+                    logger.error(f"Error updating live status in chat {chat_id}: {e}")
+                    logger.debug(traceback.format_exc())
+                    return None
+            try:
+                bot.pin_chat_message(chat_id=chat_id, message_id=message.message_id, disable_notification=True)
+            except Exception as e:
+                logger.warning(f"Could not pin live status message in chat {chat_id}: {e}")
+            return message.message_id
+        return None
+
+live_status = LiveStatus(LIVE_STATUS_FILE, TELEGRAM_LIVE_STATUS_INTERVAL)
+
+# --------------------- LNbits Circuit Breaker ---------------------
+#
+# Every LNbits request goes through one circuit breaker. While it is closed,
+# the outcomes of the last LNBITS_BREAKER_WINDOW requests are tracked; once the
+# failure rate reaches LNBITS_BREAKER_FAILURE_RATE it opens and requests fail
+# immediately instead of waiting for the timeout. After LNBITS_BREAKER_COOLDOWN
+# seconds a single probe request is let through (half-open): its success closes
+# the circuit, its failure opens it again. Callers that can live with old data
+# are answered from the last successful response in the meantime.
+
+LNBITS_TIMEOUT = 10
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling LNbits while the circuit breaker is open.
+    """
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker with closed, open and half-open states.
+    """
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failure_rate, window, cooldown):
+        self.failure_rate = failure_rate
+        self.cooldown = cooldown
+        # Do not judge the failure rate on fewer outcomes than this
+        self.min_calls = max(1, min(window, 5))
+        self.outcomes = deque(maxlen=max(1, window))
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """
+        Check whether a request may be made now. In the half-open state only
+        the first caller gets through, as the probe.
+        """
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                logger.info("LNbits circuit half-open, probing with one request.")
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            if self.state != self.CLOSED:
+                logger.info("LNbits is reachable again, circuit closed.")
+                self.state = self.CLOSED
+                self.outcomes.clear()
+            self.outcomes.append(True)
+
+    def record_failure(self):
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                self.trip()
+                return
+            if self.state == self.OPEN:
+                return
+            self.outcomes.append(False)
+            failures = self.outcomes.count(False)
+            if len(self.outcomes) >= self.min_calls and failures / len(self.outcomes) >= self.failure_rate:
+                self.trip()
+
+    def trip(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        logger.warning(f"LNbits circuit open, failing fast for {self.cooldown:g} seconds.")
+
+    def status(self):
+        with self.lock:
+            return {
+                "state": self.state,
+                "recent_failures": self.outcomes.count(False),
+                "recent_requests": len(self.outcomes)
+            }
+
+class LastKnownGood:
+    """
+    The last successful LNbits response per key, served while LNbits is failing.
+    """
+    def __init__(self):
+        self.entries = {}
+        self.stale_keys = set()
+        self.lock = threading.Lock()
+
+    def store(self, key, data):
+        with self.lock:
+            self.entries[key] = (data, datetime.utcnow())
+            self.stale_keys.discard(key)
+
+    def fallback(self, key):
+        """
+        Return the last known data for `key` and mark it as stale, or None if there is none.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.stale_keys.add(key)
+        logger.warning(f"Serving stale {key} data from {entry[1].strftime('%Y-%m-%d %H:%M:%S')} UTC.")
+        return entry[0]
+
+    def stale_since(self, key):
+        """
+        Return when the data for `key` was fetched, if it is currently served stale.
+        """
+        with self.lock:
+            if key in self.stale_keys:
+                return self.entries[key][1]
+            return None
+
+    def status(self):
+        with self.lock:
+            return {
+                key: {"fetched_at": fetched_at.isoformat(), "stale": key in self.stale_keys}
+                for key, (_, fetched_at) in self.entries.items()
+            }
+
+lnbits_breaker = CircuitBreaker(LNBITS_BREAKER_FAILURE_RATE, LNBITS_BREAKER_WINDOW, LNBITS_BREAKER_COOLDOWN)
+lnbits_cache = LastKnownGood()
+
+# Responses kept as last known good data. Payments are not: /transactions keeps
+# only the latest ones (see handle_transactions_command), never the full history
+LNBITS_CACHED_KEYS = frozenset(("wallet", "pay_links"))
+
+def lnbits_get(url, use_breaker=True, **kwargs):
+    """
+    GET an LNbits URL through the circuit breaker.
+
+    Server errors and connection failures count against the circuit; client
+    errors (e.g. a disabled extension) do not, since LNbits itself answered.
+    With `use_breaker=False` the request bypasses the circuit completely, for
+    callers with their own retry policy such as the history backfill.
+
+    Raises:
+        CircuitOpenError: If the circuit is open and no request was made.
+    """
+    if not use_breaker:
+        return requests.get(url, headers={"X-Api-Key": LNBITS_READONLY_API_KEY}, timeout=LNBITS_TIMEOUT, **kwargs)
+    if not lnbits_breaker.allow():
+        raise CircuitOpenError("LNbits circuit is open")
+    try:
+        response = requests.get(url, headers={"X-Api-Key": LNBITS_READONLY_API_KEY}, timeout=LNBITS_TIMEOUT, **kwargs)
+    except Exception:
+        lnbits_breaker.record_failure()
+        raise
+    if response.status_code >= 500:
+        lnbits_breaker.record_failure()
+    else:
+        lnbits_breaker.record_success()
+    return response
+
+def stale_notice(key):
+    """
+    Markdown line telling Telegram users that `key` data is served stale, or "".
+    """
+    fetched_at = lnbits_cache.stale_since(key)
+    if fetched_at is None:
+        return ""
+    return f"⚠️ _LNbits is unreachable, showing data from {fetched_at.strftime('%Y-%m-%d %H:%M:%S')} UTC._"
+
 # --------------------- Functions ---------------------
 
-def fetch_api(endpoint):
+# Number of failed LNbits requests; the adaptive scheduler backs off when it grows
+lnbits_error_count = 0
+
+def record_lnbits_error():
+    """
+    Count a failed LNbits request.
+    """
+    global lnbits_error_count
+    lnbits_error_count += 1
+
+def fetch_api(endpoint, allow_stale=False, use_breaker=True):
     """
     Fetch data from the LNbits API.
+
+    Parameters:
+        endpoint (str): Path below /api/v1/, e.g. "wallet".
+        allow_stale (bool): Return the last successful response while LNbits is failing.
+        use_breaker (bool): Go through the LNbits circuit breaker (see lnbits_get).
     """
     url = f"{LNBITS_URL}/api/v1/{endpoint}"
-    headers = {"X-Api-Key": LNBITS_READONLY_API_KEY}
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = lnbits_get(url, use_breaker=use_breaker)
         if response.status_code == 200:
-            data = response.json()
-            logger.debug(f"Fetched data from {endpoint}: {data}")
+            data = json_loads(response.content)
+            logger.debug("Fetched data from %s: %s", endpoint, Payload(data))
+            if endpoint in LNBITS_CACHED_KEYS:
+                lnbits_cache.store(endpoint, data)
             return data
         else:
             logger.error(f"Error fetching {endpoint}. Status Code: {response.status_code}")
-            return None
+            record_lnbits_error()
+    except CircuitOpenError:
+        logger.warning(f"Not fetching {endpoint}: LNbits circuit is open.")
+        record_lnbits_error()
     except Exception as e:
         logger.error(f"Error fetching {endpoint}: {e}")
+        record_lnbits_error()
         logger.debug(traceback.format_exc())
-        return None
+    return lnbits_cache.fallback(endpoint) if allow_stale else None
+
+def iter_json_array(chunks):
+    """
+    Incrementally decode a JSON array from an iterable of byte chunks.
+
+    Items are yielded one by one as soon as they are complete, so the full
+    array is never held in memory.
+
+    Parameters:
+        chunks (iterable): Raw UTF-8 encoded byte chunks.
+
+    Yields:
+        The decoded array items.
+
+    Raises:
+        ValueError: If the payload is not a JSON array.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ""
+    started = False
+    for chunk in chunks:
+        buffer += text_decoder.decode(chunk)
+        pos = 0
+        length = len(buffer)
+        if not started:
+            while pos < length and buffer[pos].isspace():
+                pos += 1
+            if pos == length:
+                buffer = ""
+                continue
+            if buffer[pos] != '[':
+                raise ValueError("Expected a JSON array.")
+            started = True
+            pos += 1
+        while True:
+            while pos < length and (buffer[pos].isspace() or buffer[pos] == ','):
+                pos += 1
+            if pos == length:
+                break
+            if buffer[pos] == ']':
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # Item is incomplete, wait for more data
+            if end == length or buffer[end] not in ' \t\r\n,]':
+                break  # A trailing number might still be cut off
+            yield item
+            pos = end
+        buffer = buffer[pos:]
+    if started:
+        raise ValueError("Unterminated JSON array.")
+    raise ValueError("Expected a JSON array.")
+
+def fetch_api_stream(endpoint, chunk_size=64 * 1024):
+    """
+    Fetch a JSON array from the LNbits API and yield its items one by one.
+
+    The response body is streamed and decoded incrementally, and the payload is
+    never logged. Closing the generator early stops reading the response.
+    """
+    url = f"{LNBITS_URL}/api/v1/{endpoint}"
+    try:
+        response = lnbits_get(url, stream=True)
+    except CircuitOpenError:
+        logger.warning(f"Not fetching {endpoint}: LNbits circuit is open.")
+        record_lnbits_error()
+        return
+    except Exception as e:
+        logger.error(f"Error fetching {endpoint}: {e}")
+        record_lnbits_error()
+        logger.debug(traceback.format_exc())
+        return
+    try:
+        if response.status_code != 200:
+            logger.error(f"Error fetching {endpoint}. Status Code: {response.status_code}")
+            record_lnbits_error()
+            return
+        count = 0
+        for item in iter_json_array(response.iter_content(chunk_size=chunk_size)):
+            count += 1
+            yield item
+        logger.debug("Streamed %d items from %s.", count, endpoint)
+    except Exception as e:
+        logger.error(f"Error streaming {endpoint}: {e}")
+        lnbits_breaker.record_failure()
+        record_lnbits_error()
+        logger.debug(traceback.format_exc())
+    finally:
+        response.close()
 
 def fetch_pay_links():
     """
     Fetch Pay-Links from the LNbits LNURLp Extension API.
+
+    While LNbits is failing, the last successfully fetched Pay-Links are returned.
     """
     url = f"{LNBITS_URL}/lnurlp/api/v1/links"
-    headers = {"X-Api-Key": LNBITS_READONLY_API_KEY}
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = lnbits_get(url)
         if response.status_code == 200:
-            data = response.json()
-            logger.debug(f"Fetched Pay-Links: {data}")
+            data = json_loads(response.content)
+            logger.debug("Fetched Pay-Links: %s", Payload(data))
+            lnbits_cache.store("pay_links", data)
             return data
         else:
             logger.error(f"Error fetching Pay-Links. Status Code: {response.status_code}")
-            return None
+            record_lnbits_error()
+    except CircuitOpenError:
+        logger.warning("Not fetching Pay-Links: LNbits circuit is open.")
+        record_lnbits_error()
     except Exception as e:
         logger.error(f"Error fetching Pay-Links: {e}")
+        record_lnbits_error()
         logger.debug(traceback.format_exc())
-        return None
+    return lnbits_cache.fallback("pay_links")
 
 def get_lnurlp_info(lnurlp_id):
     """
     Fetch LNURLp information for a given lnurlp_id.
+
+    Dashboard processes answer from the shared snapshot instead of calling LNbits.
     """
+    if PROCESS_ROLE == "dashboard":
+        pay_link = current_state.pay_link
+        if pay_link is None or pay_link.get("id") != lnurlp_id:
+            logger.error(f"No Pay-Link with ID {lnurlp_id} in the state snapshot.")
+            return None
+        return dict(pay_link)
+
     pay_links = fetch_pay_links()
     if pay_links is None:
         logger.error("Cannot fetch Pay-Links.")
@@ -347,28 +2080,36 @@ def get_lnurlp_info(lnurlp_id):
 
     for pay_link in pay_links:
         if pay_link.get("id") == lnurlp_id:
-            logger.debug(f"Matching Pay-Link found: {pay_link}")
+            logger.debug("Matching Pay-Link found: %s", Payload(pay_link))
+            if lnurlp_id == LNURLP_ID and current_state.pay_link != pay_link:
+                publish_state(pay_link=pay_link)  # Share it with dashboard processes
             return pay_link
 
     logger.error(f"No Pay-Link found with ID {lnurlp_id}.")
     return None
 
-def fetch_donation_details():
+def fetch_donation_details(snapshot=None):
     """
     Fetch LNURLp information and integrate the Lightning Address and LNURL into the donation details.
     
+    Parameters:
+        snapshot (StateSnapshot, optional): State to report on. Defaults to the current snapshot.
+    
     Returns:
         dict: A dictionary containing total donations, donations list, Lightning Address, and LNURL.
     """
+    if snapshot is None:
+        snapshot = current_state
     lnurlp_info = get_lnurlp_info(LNURLP_ID)
     if lnurlp_info is None:
         logger.error("Cannot fetch LNURLp information for donation details.")
         return {
-            "total_donations": total_donations,
-            "donations": donations,
+            "total_donations": snapshot.total_donations,
+            "donations": snapshot.donations,
             "lightning_address": "Not Available",
             "lnurl": "Not Available",
-            "highlight_threshold": HIGHLIGHT_THRESHOLD  # Include threshold
+            "highlight_threshold": HIGHLIGHT_THRESHOLD,  # Include threshold
+            "stale": False
         }
 
     # Extract the username and construct the Lightning Address
@@ -383,15 +2124,16 @@ def fetch_donation_details():
     # Extract the LNURL
     lnurl = lnurlp_info.get('lnurl', 'Not Available')  # Adjust key based on your data structure
 
-    logger.debug(f"Constructed Lightning Address: {lightning_address}")
-    logger.debug(f"Fetched LNURL: {lnurl}")
+    logger.debug("Constructed Lightning Address: %s", lightning_address)
+    logger.debug("Fetched LNURL: %s", lnurl)
 
     return {
-        "total_donations": total_donations,
-        "donations": donations,
+        "total_donations": snapshot.total_donations,
+        "donations": snapshot.donations,
         "lightning_address": lightning_address,
         "lnurl": lnurl,
-        "highlight_threshold": HIGHLIGHT_THRESHOLD  # Include threshold
+        "highlight_threshold": HIGHLIGHT_THRESHOLD,  # Include threshold
+        "stale": lnbits_cache.stale_since("pay_links") is not None  # Pay-Link from before an LNbits outage
     }
 
 def update_donations_with_details(data):
@@ -419,7 +2161,7 @@ def updateDonations(data):
     This function has been extended to include Lightning Address and LNURL in the data sent to the frontend.
     
     Parameters:
-        data (dict): The data containing total donations and the donations list.
+        data (dict): The data containing total donations, the donations list and the latest donation.
     """
     # Integrate additional donation details
     updated_data = update_donations_with_details(data)
@@ -430,11 +2172,11 @@ def updateDonations(data):
     # Therefore, no direct DOM manipulation here
     
     # Update the latest donation
-    if updated_data["donations"]:
-        latestDonation = updated_data["donations"][-1]
+    latestDonation = updated_data.get("latest_donation")
+    if latestDonation is not None:
         # Frontend handles DOM updates
         sanitized_memo = sanitize_memo(latestDonation["memo"], FORBIDDEN_WORDS)
-        logger.info(f'Latest donation: {latestDonation["amount"]} sats - "{sanitized_memo}"')
+        logger.info('Latest donation: %s sats - "%s"', latestDonation["amount"], sanitized_memo)
     else:
         logger.info('Latest donation: No donations yet.')
     
@@ -442,40 +2184,92 @@ def updateDonations(data):
     # Frontend retrieves this via the API
     
     # Update Lightning Address and LNURL
-    logger.debug(f"Lightning Address: {updated_data.get('lightning_address')}")
-    logger.debug(f"LNURL: {updated_data.get('lnurl')}")
+    logger.debug("Lightning Address: %s", updated_data.get('lightning_address'))
+    logger.debug("LNURL: %s", updated_data.get('lnurl'))
     
     # Save the updated donations data
     save_donations()
 
+def donation_from_payment(payment, date):
+    """
+    Build a donation record from a payment made through the configured LNURLp link.
+
+    Parameters:
+        payment (dict): A payment as returned by the LNbits API.
+        date (str): ISO 8601 timestamp to record for the donation.
+
+    Returns:
+        dict: The donation, or None if the payment is not a donation.
+    """
+    extra_data = payment.get("extra") or {}
+    if extra_data.get("link") != LNURLP_ID:
+        return None
+
+    donation_memo = extra_data.get("comment", "No Memo")
+    # Ensure 'extra' is a numeric value in msats
+    try:
+        donation_amount_msat = int(extra_data.get("extra", 0))
+        donation_amount_sats = donation_amount_msat / 1000  # Convert msats to sats
+    except (ValueError, TypeError):
+        # Fallback if 'extra' is not numeric
+        try:
+            donation_amount_sats = int(abs(payment.get("amount", 0)) / 1000)
+        except (ValueError, TypeError):
+            donation_amount_sats = 0
+    return {
+        "date": date,
+        "memo": donation_memo,
+        "amount": donation_amount_sats
+    }
+
 def send_latest_payments():
     """
     Fetch the latest payments and send a notification via Telegram.
     Additionally, check if payments qualify as donations.
+
+    Returns:
+        bool: True if new payments were found.
     """
-    global total_donations, donations, last_update  # Declare global variables
+    global donations  # Declare global variables
     logger.info("Fetching the latest payments...")
-    payments = fetch_api("payments")
-    if payments is None:
-        return
-
-    if not isinstance(payments, list):
-        logger.error("Unexpected data format for payments.")
-        return
+    # LNbits returns payments newest first: stream them and stop at the first
+    # already-processed payment or after the latest n payments.
+    latest = []
+    payments = fetch_api_stream("payments")
+    try:
+        for payment in payments:
+            if not isinstance(payment, dict):
+                logger.error("Unexpected data format for payments.")
+                return False
+            if payment.get("payment_hash") in processed_payments:
+                break
+            latest.append(payment)
+            if len(latest) >= LATEST_TRANSACTIONS_COUNT:
+                break
+    finally:
+        payments.close()
+
+    # Mirror the new payments into the ledger right away
+    try:
+        ledger_upsert(latest)
+    except Exception as e:
+        logger.error(f"Error updating the payment ledger: {e}")
+        logger.debug(traceback.format_exc())
 
     # Sort payments by creation time descending
-    sorted_payments = sorted(payments, key=lambda x: x.get("created_at", ""), reverse=True)
-    latest = sorted_payments[:LATEST_TRANSACTIONS_COUNT]  # Fetch the latest n payments
+    latest.sort(key=lambda x: x.get("created_at", ""), reverse=True)
 
     if not latest:
         logger.info("No payments found.")
-        return
+        return False
 
     # Initialize lists for different payment types
     incoming_payments = []
     outgoing_payments = []
     pending_payments = []
     new_processed_hashes = []
+    new_payment_records = []
+    new_donations = []
 
     for payment in latest:
         payment_hash = payment.get("payment_hash")
@@ -510,42 +2304,103 @@ def send_latest_payments():
                 })
 
         # Check for donations via LNURLp ID
-        extra_data = payment.get("extra", {})
-        lnurlp_id_payment = extra_data.get("link")
-        if lnurlp_id_payment == LNURLP_ID:
-            # It's a donation
-            donation_memo = extra_data.get("comment", "No Memo")
-            # Ensure 'extra' is a numeric value in msats
-            try:
-                donation_amount_msat = int(extra_data.get("extra", 0))
-                donation_amount_sats = donation_amount_msat / 1000  # Convert msats to sats
-            except (ValueError, TypeError):
-                donation_amount_sats = amount_sats  # Fallback if 'extra' is not numeric
-            donation = {
-                "date": datetime.utcnow().isoformat(),
-                "memo": donation_memo,
-                "amount": donation_amount_sats
-            }
-            donations.append(donation)
-            total_donations += donation_amount_sats
-            last_update = datetime.utcnow()
+        donation = donation_from_payment(payment, datetime.utcnow().isoformat())
+        if donation is not None:
+            new_donations.append(donation)
             # **Fixed Line:** Pass donation_memo as a string
-            sanitized_memo = sanitize_memo(donation_memo, FORBIDDEN_WORDS)
-            logger.info(f"New donation detected: {donation_amount_sats} sats - {sanitized_memo}")
-            updateDonations({
-                "total_donations": total_donations,
-                "donations": donations
-            })  # Update donations with details
+            sanitized_memo = sanitize_memo(donation["memo"], FORBIDDEN_WORDS)
+            logger.info("New donation detected: %s sats - %s", donation["amount"], sanitized_memo)
+
+        # Mark the payment as processed
+        processed_payments.add(payment_hash)
+        new_processed_hashes.append(payment_hash)
+        new_payment_records.append({
+            "payment_hash": payment_hash,
+            "amount": amount_sats,
+            "direction": "incoming" if amount_msat >= 0 else "outgoing",
+            "status": status.lower(),
+            "date": payment_date(payment)
+        })
+        add_processed_payment(payment_hash)
+
+    if new_payment_records:
+        # Newest last; the ring buffer drops the oldest records once full
+        latest_payments.extend(reversed(new_payment_records))
+        publish_state(latest_payments=latest_payments)
+
+    if new_processed_hashes:
+        # Record the balance right after the payments that changed it
+        wallet_info = fetch_api("wallet")
+        if wallet_info is not None:
+            record_balance(wallet_info.get("balance", 0))
+            if TELEGRAM_LIVE_STATUS:
+                # Keep the balance of the live status current; the balance file stays
+                # with check_balance_change so its notifications still see the change
+                current_balance_sats = wallet_info.get("balance", 0) / 1000
+                publish_state(latest_balance={
+                    "balance_sats": current_balance_sats,
+                    "last_change": "Balance after new payments.",
+                    "memo": "N/A"
+                })
+
+    if new_donations:
+        with donations_lock:
+            for donation in new_donations:
+                donations.append(donation)
+            # Publish the whole batch at once so readers never see a partial update;
+            # the total is derived from the integer msat amounts
+            snapshot = publish_state(
+                donations=donations,
+                last_update=datetime.utcnow()
+            )
+        # Fetching the LNURLp details and saving happen outside the lock
+        memo_index.catch_up(snapshot)
+        updateDonations({
+            "total_donations": snapshot.total_donations,
+            "donations": snapshot.donations,
+            "latest_donation": snapshot.latest_donation
+        })  # Update donations with details
+
+    keyboard = []
+    if DONATIONS_URL:
+        keyboard.append([InlineKeyboardButton("🐽 Show Piggy Bank", url=DONATIONS_URL)])
+    keyboard.append([InlineKeyboardButton("🧮 Show Transactions", callback_data='view_transactions')])
+    reply_markup = InlineKeyboardMarkup(keyboard)
+
+    if TELEGRAM_LIVE_STATUS:
+        live_status.request_update()
+        # Chats with a live status only get highlighted incoming payments as messages of their own
+        highlighted = [payment for payment in incoming_payments if payment["amount"] >= HIGHLIGHT_THRESHOLD]
+        if highlighted and not notify_subscribers(
+            "transactions", render_payments_message(highlighted, [], []), live=True,
+            parse_mode=ParseMode.MARKDOWN, reply_markup=reply_markup
+        ):
+            logger.error("Error sending highlighted payments message to Telegram: no subscriber received it.")
+
+    if not incoming_payments and not outgoing_payments and not pending_payments:
+        logger.info("No new payments to notify.")
+        return True
+
+    full_message = render_payments_message(incoming_payments, outgoing_payments, pending_payments)
+
+    # Send the message to all transaction subscribers with the inline keyboard
+    if notify_subscribers("transactions", full_message, parse_mode=ParseMode.MARKDOWN, reply_markup=reply_markup):
+        logger.info("Latest payments notification successfully sent to Telegram.")
+    else:
+        logger.error("Error sending payments message to Telegram: no subscriber received it.")
+
+    return True
 
-        # Mark the payment as processed
-        processed_payments.add(payment_hash)
-        new_processed_hashes.append(payment_hash)
-        add_processed_payment(payment_hash)
+def render_payments_message(incoming_payments, outgoing_payments, pending_payments):
+    """
+    Render the Telegram notification for new payments.
 
-    if not incoming_payments and not outgoing_payments and not pending_payments:
-        logger.info("No new payments to notify.")
-        return
+    Parameters:
+        incoming_payments, outgoing_payments, pending_payments (list): Dicts with "amount" (sats) and "memo".
 
+    Returns:
+        str: The Markdown message.
+    """
     message_lines = [
         f"⚡ *{INSTANCE_NAME}* - *Latest Transactions* ⚡\n"
     ]
@@ -583,28 +2438,12 @@ def send_latest_payments():
     timestamp_text = f"🕒 *Timestamp:* {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC"
     message_lines.append(timestamp_text)
 
-    full_message = "\n".join(message_lines)
-
-    keyboard = []
-    if DONATIONS_URL:
-        keyboard.append([InlineKeyboardButton("🐽 Show Piggy Bank", url=DONATIONS_URL)])
-    keyboard.append([InlineKeyboardButton("🧮 Show Transactions", callback_data='view_transactions')])
-    reply_markup = InlineKeyboardMarkup(keyboard)
-
-    # Send the message to Telegram with the inline keyboard
-    try:
-        bot.send_message(chat_id=CHAT_ID, text=full_message, parse_mode=ParseMode.MARKDOWN, reply_markup=reply_markup)
-        logger.info("Latest payments notification successfully sent to Telegram.")
-        latest_payments.extend(new_processed_hashes)
-    except Exception as telegram_error:
-        logger.error(f"Error sending payments message to Telegram: {telegram_error}")
-        logger.debug(traceback.format_exc())
+    return "\n".join(message_lines)
 
 def check_balance_change():
     """
     Periodically check the wallet balance and notify if it changes beyond the threshold.
     """
-    global last_update
     logger.info("Checking balance changes...")
     wallet_info = fetch_api("wallet")
     if wallet_info is None:
@@ -612,19 +2451,31 @@ def check_balance_change():
 
     current_balance_msat = wallet_info.get("balance", 0)
     current_balance_sats = current_balance_msat / 1000  # Convert msats to sats
+    record_balance(current_balance_msat)
 
     last_balance = load_last_balance()
 
     if last_balance is None:
         # First run, initialize the balance file
         save_current_balance(current_balance_sats)
-        latest_balance["balance_sats"] = current_balance_sats
-        latest_balance["last_change"] = "Initial balance set."
-        latest_balance["memo"] = "N/A"
+        publish_state(latest_balance={
+            "balance_sats": current_balance_sats,
+            "last_change": "Initial balance set.",
+            "memo": "N/A"
+        })
         logger.info(f"Initial balance set to {current_balance_sats:.0f} sats.")
         return
 
     change_amount = current_balance_sats - last_balance
+    if TELEGRAM_LIVE_STATUS and current_balance_sats != current_state.latest_balance["balance_sats"]:
+        # Chats with a live status see every change in their pinned message
+        publish_state(latest_balance={
+            "balance_sats": current_balance_sats,
+            "last_change": f"Balance {'increased' if change_amount > 0 else 'decreased'} by {int(abs(change_amount)):,} sats.",
+            "memo": "N/A"
+        })
+        live_status.request_update()
+
     if abs(change_amount) < BALANCE_CHANGE_THRESHOLD:
         logger.info(f"Balance change ({abs(change_amount):.0f} sats) below threshold ({BALANCE_CHANGE_THRESHOLD} sats). No notification sent.")
         return
@@ -647,18 +2498,18 @@ def check_balance_change():
     keyboard.append([InlineKeyboardButton("🧮 Show Transactions", callback_data='view_transactions')])
     reply_markup = InlineKeyboardMarkup(keyboard)
 
-    # Send the message to Telegram with the inline keyboard
-    try:
-        bot.send_message(chat_id=CHAT_ID, text=message, parse_mode=ParseMode.MARKDOWN, reply_markup=reply_markup)
+    # Send the message to all balance subscribers with the inline keyboard
+    if notify_subscribers("balance", message, parse_mode=ParseMode.MARKDOWN, reply_markup=reply_markup):
         logger.info(f"Balance changed from {last_balance:.0f} to {current_balance_sats:.0f} sats. Notification sent.")
         # Update the balance file and latest balance data
         save_current_balance(current_balance_sats)
-        latest_balance["balance_sats"] = current_balance_sats
-        latest_balance["last_change"] = f"Balance {direction} by {int(abs_change):,} sats."
-        latest_balance["memo"] = "N/A"
-    except Exception as telegram_error:
-        logger.error(f"Error sending balance change message to Telegram: {telegram_error}")
-        logger.debug(traceback.format_exc())
+        publish_state(latest_balance={
+            "balance_sats": current_balance_sats,
+            "last_change": f"Balance {direction} by {int(abs_change):,} sats.",
+            "memo": "N/A"
+        })
+    else:
+        logger.error("Error sending balance change message to Telegram: no subscriber received it.")
 
 def send_wallet_balance():
     """
@@ -671,23 +2522,41 @@ def send_wallet_balance():
 
     current_balance_msat = wallet_info.get("balance", 0)
     current_balance_sats = current_balance_msat / 1000  # Convert msats to sats
+    record_balance(current_balance_msat)
+
+    ledger_synced = sync_ledger() is not None
+    if TELEGRAM_LIVE_STATUS:
+        # Chats with a live status get the daily report as a refresh of their pinned message
+        publish_state(latest_balance={
+            "balance_sats": current_balance_sats,
+            "last_change": "Daily balance report.",
+            "memo": "N/A"
+        })
+        live_status.request_update()
+        if not notification_chats("daily"):
+            return
 
-    # Fetch payments to calculate counts and totals
-    payments = fetch_api("payments")
     incoming_count = outgoing_count = 0
     incoming_total = outgoing_total = 0
-    if payments and isinstance(payments, list):
-        for payment in payments:
-            amount_msat = payment.get("amount", 0)
-            status = payment.get("status", "completed")
-            if status.lower() == "pending":
-                continue  # Exclude pending payments for daily balance
-            if amount_msat > 0:
-                incoming_count += 1
-                incoming_total += amount_msat / 1000
-            elif amount_msat < 0:
-                outgoing_count += 1
-                outgoing_total += abs(amount_msat) / 1000
+    if ledger_synced:
+        # Counts and totals from the freshly synced local ledger
+        totals = ledger_totals()
+        incoming_count, incoming_total = totals["incoming"][0], totals["incoming"][1] / 1000
+        outgoing_count, outgoing_total = totals["outgoing"][0], totals["outgoing"][1] / 1000
+    else:
+        # Stream payments to calculate counts and totals without loading the full history
+        for payment in fetch_api_stream("payments"):
+            if isinstance(payment, dict):
+                amount_msat = payment.get("amount", 0)
+                status = payment.get("status", "completed")
+                if status.lower() == "pending":
+                    continue  # Exclude pending payments for daily balance
+                if amount_msat > 0:
+                    incoming_count += 1
+                    incoming_total += amount_msat / 1000
+                elif amount_msat < 0:
+                    outgoing_count += 1
+                    outgoing_total += abs(amount_msat) / 1000
 
     # Prepare the Telegram message with Markdown formatting
     message = (
@@ -704,26 +2573,42 @@ def send_wallet_balance():
     keyboard.append([InlineKeyboardButton("🧮 Show Transactions", callback_data='view_transactions')])
     reply_markup = InlineKeyboardMarkup(keyboard)
 
-    # Send the message to Telegram with the inline keyboard
-    try:
-        bot.send_message(chat_id=CHAT_ID, text=message, parse_mode=ParseMode.MARKDOWN, reply_markup=reply_markup)
+    # Send the message to all daily report subscribers with the inline keyboard
+    if notify_subscribers("daily", message, parse_mode=ParseMode.MARKDOWN, reply_markup=reply_markup):
         logger.info("Daily wallet balance notification with inline keyboard successfully sent.")
         # Update the latest balance data
-        latest_balance["balance_sats"] = current_balance_sats
-        latest_balance["last_change"] = "Daily balance report."
-        latest_balance["memo"] = "N/A"
+        publish_state(latest_balance={
+            "balance_sats": current_balance_sats,
+            "last_change": "Daily balance report.",
+            "memo": "N/A"
+        })
         # Save the current balance
         save_current_balance(current_balance_sats)
-    except Exception as telegram_error:
-        logger.error(f"Error sending daily wallet balance message to Telegram: {telegram_error}")
-        logger.debug(traceback.format_exc())
+    else:
+        logger.error("Error sending daily wallet balance message to Telegram: no subscriber received it.")
 
 def handle_transactions_command(chat_id):
     """
     Handle the /transactions command sent by the user.
     """
     logger.info(f"Handling /transactions command for chat_id: {chat_id}")
-    payments = fetch_api("payments")
+    if ledger_ready():
+        # Answer from the local ledger instead of downloading the full history
+        payments, _ = query_ledger(limit=LATEST_TRANSACTIONS_COUNT)
+        notice = ""
+    else:
+        # LNbits returns payments newest first; read and cache only the latest n
+        errors_before = lnbits_error_count
+        stream = fetch_api_stream("payments")
+        try:
+            payments = list(itertools.islice(stream, LATEST_TRANSACTIONS_COUNT))
+        finally:
+            stream.close()
+        if lnbits_error_count == errors_before:
+            lnbits_cache.store("payments", payments)
+        else:
+            payments = lnbits_cache.fallback("payments")
+        notice = stale_notice("payments")
     if payments is None:
         bot.send_message(chat_id=chat_id, text="Error fetching transactions.")
         return
@@ -776,6 +2661,8 @@ def handle_transactions_command(chat_id):
     message_lines = [
         f"⚡ *{INSTANCE_NAME}* - *Latest Transactions* ⚡\n"
     ]
+    if notice:
+        message_lines.append(f"{notice}\n")
 
     if incoming_payments:
         message_lines.append("🟢 *Incoming Payments:*")
@@ -837,6 +2724,12 @@ def handle_info_command(chat_id):
         f"📊 *Daily Wallet Balance Notification Interval:* Every `{WALLET_BALANCE_NOTIFICATION_INTERVAL} seconds`\n"
         f"🔄 *Latest Payments Fetch Interval:* Every `{PAYMENTS_FETCH_INTERVAL} seconds`"
     )
+    if TELEGRAM_LIVE_STATUS:
+        interval_info += f"\n📌 *Live Status:* Updated at most every `{TELEGRAM_LIVE_STATUS_INTERVAL:g} seconds`"
+    if ADAPTIVE_POLLING:
+        interval_info += (
+            f"\n⚙️ *Adaptive Polling:* `{PAYMENTS_FETCH_MIN_INTERVAL}-{PAYMENTS_FETCH_MAX_INTERVAL} seconds`"
+        )
 
     info_message = (
         f"ℹ️ *{INSTANCE_NAME}* - *Information*\n\n"
@@ -861,16 +2754,22 @@ def handle_balance_command(chat_id):
     Handle the /balance command sent by the user.
     """
     logger.info(f"Handling /balance command for chat_id: {chat_id}")
-    wallet_info = fetch_api("wallet")
+    wallet_info = fetch_api("wallet", allow_stale=True)
     if wallet_info is None:
         bot.send_message(chat_id=chat_id, text="Error fetching wallet balance.")
         return
 
     current_balance_msat = wallet_info.get("balance", 0)
     current_balance_sats = current_balance_msat / 1000  # Convert msats to sats
+    notice = stale_notice("wallet")
+    if notice:
+        notice += "\n\n"
+    else:
+        record_balance(current_balance_msat)  # Stale balances are not history
 
     message = (
         f"📊 *{INSTANCE_NAME}* - *Wallet Balance*\n\n"
+        f"{notice}"
         f"🔹 *Current Balance:* `{int(current_balance_sats)} sats`\n\n"
         f"🕒 *Timestamp:* {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC"
     )
@@ -963,51 +2862,812 @@ def process_callback_query(callback_query):
         logger.error(f"Error processing callback query: {e}")
         logger.debug(traceback.format_exc())
 
+class AdaptiveJob:
+    """
+    Periodic job on its own thread whose interval adapts to activity.
+
+    The interval drops to `min_interval` after a run that reports activity,
+    grows gradually while idle and doubles after LNbits errors, always capped
+    at `max_interval`. Every delay is jittered, and runs never overlap since
+    the next one is only planned once the previous one has finished.
+    """
+    IDLE_BACKOFF_FACTOR = 1.5
+
+    def __init__(self, func, job_id, interval, min_interval, max_interval):
+        self.func = func
+        self.job_id = job_id
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.stopped = threading.Event()
+
+    def start(self, first_delay):
+        threading.Thread(target=self.loop, args=(first_delay,), name=self.job_id, daemon=True).start()
+
+    def stop(self):
+        self.stopped.set()
+
+    def loop(self, delay):
+        while not self.stopped.wait(delay):
+            self.run()
+            delay = with_jitter(self.interval)
+            logger.debug("Next %s run in %.0f seconds.", self.job_id, delay)
+
+    def run(self):
+        errors_before = lnbits_error_count
+        failed = False
+        activity = False
+        try:
+            activity = self.func()
+        except Exception as e:
+            failed = True
+            logger.error(f"Error running {self.job_id}: {e}")
+            logger.debug(traceback.format_exc())
+
+        if failed or lnbits_error_count > errors_before:
+            self.interval = min(self.interval * 2, self.max_interval)
+        elif activity:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.IDLE_BACKOFF_FACTOR, self.max_interval)
+
+def with_jitter(seconds):
+    """
+    Randomize a delay by +/- SCHEDULER_JITTER to avoid synchronized requests.
+    """
+    return seconds * random.uniform(1 - SCHEDULER_JITTER, 1 + SCHEDULER_JITTER)
+
 def start_scheduler():
     """
     Start the scheduler for periodic tasks using BackgroundScheduler.
     """
-    scheduler = BackgroundScheduler(timezone='UTC')
+    scheduler = BackgroundScheduler(timezone='UTC', job_defaults={'coalesce': True, 'max_instances': 1})
+    # Stagger the first runs instead of firing all jobs at once
+    start_delays = iter(1 + i * SCHEDULER_STAGGER for i in range(5))
 
-    if WALLET_INFO_UPDATE_INTERVAL > 0:
+    def interval_job(func, interval, job_id):
         scheduler.add_job(
-            check_balance_change,
+            func,
             'interval',
-            seconds=WALLET_INFO_UPDATE_INTERVAL,
-            id='balance_check',
-            next_run_time=datetime.utcnow() + timedelta(seconds=1)
+            seconds=interval,
+            id=job_id,
+            jitter=min(int(interval * SCHEDULER_JITTER), 60),
+            next_run_time=datetime.utcnow() + timedelta(seconds=next(start_delays))
         )
+
+    if PAYMENTS_FETCH_INTERVAL > 0:
+        if ADAPTIVE_POLLING:
+            AdaptiveJob(
+                send_latest_payments,
+                'latest_payments_fetch',
+                PAYMENTS_FETCH_INTERVAL,
+                PAYMENTS_FETCH_MIN_INTERVAL,
+                PAYMENTS_FETCH_MAX_INTERVAL
+            ).start(next(start_delays))
+            logger.info(f"Latest payments fetch scheduled adaptively every {PAYMENTS_FETCH_MIN_INTERVAL}-{PAYMENTS_FETCH_MAX_INTERVAL} seconds.")
+        else:
+            interval_job(send_latest_payments, PAYMENTS_FETCH_INTERVAL, 'latest_payments_fetch')
+            logger.info(f"Latest payments fetch scheduled every {PAYMENTS_FETCH_INTERVAL} seconds.")
+    else:
+        logger.info("Fetching latest payments is disabled (PAYMENTS_FETCH_INTERVAL set to 0).")
+
+    if WALLET_INFO_UPDATE_INTERVAL > 0:
+        interval_job(check_balance_change, WALLET_INFO_UPDATE_INTERVAL, 'balance_check')
         logger.info(f"Balance change monitoring scheduled every {WALLET_INFO_UPDATE_INTERVAL} seconds.")
     else:
         logger.info("Balance change monitoring is disabled (WALLET_INFO_UPDATE_INTERVAL set to 0).")
 
     if WALLET_BALANCE_NOTIFICATION_INTERVAL > 0:
-        scheduler.add_job(
-            send_wallet_balance,
-            'interval',
-            seconds=WALLET_BALANCE_NOTIFICATION_INTERVAL,
-            id='wallet_balance_notification',
-            next_run_time=datetime.utcnow() + timedelta(seconds=1)
-        )
+        interval_job(send_wallet_balance, WALLET_BALANCE_NOTIFICATION_INTERVAL, 'wallet_balance_notification')
         logger.info(f"Daily wallet balance notification scheduled every {WALLET_BALANCE_NOTIFICATION_INTERVAL} seconds.")
     else:
         logger.info("Daily wallet balance notification is disabled (WALLET_BALANCE_NOTIFICATION_INTERVAL set to 0).")
 
-    if PAYMENTS_FETCH_INTERVAL > 0:
-        scheduler.add_job(
-            send_latest_payments,
-            'interval',
-            seconds=PAYMENTS_FETCH_INTERVAL,
-            id='latest_payments_fetch',
-            next_run_time=datetime.utcnow() + timedelta(seconds=1)
-        )
-        logger.info(f"Latest payments fetch scheduled every {PAYMENTS_FETCH_INTERVAL} seconds.")
+    if LEDGER_SYNC_INTERVAL > 0:
+        interval_job(sync_ledger, LEDGER_SYNC_INTERVAL, 'ledger_sync')
+        logger.info(f"Payment ledger sync scheduled every {LEDGER_SYNC_INTERVAL} seconds.")
     else:
-        logger.info("Fetching latest payments is disabled (PAYMENTS_FETCH_INTERVAL set to 0).")
+        logger.info("Payment ledger sync is disabled (LEDGER_SYNC_INTERVAL set to 0).")
+
+    if DONATION_HOT_DAYS > 0:
+        interval_job(archive_old_donations, 86400, 'donation_archive')
+        logger.info(f"Donations older than {DONATION_HOT_DAYS} days are archived daily.")
+
+    if TELEGRAM_LIVE_STATUS:
+        live_status.load()
+        live_status.request_update()
+        logger.info(f"Live status message enabled, edited at most every {TELEGRAM_LIVE_STATUS_INTERVAL} seconds.")
 
     scheduler.start()
     logger.info("Scheduler successfully started.")
 
+# --------------------- Payment Ledger ---------------------
+#
+# A local SQLite mirror of the LNbits payment history, indexed by creation time,
+# direction, status and pay link. It is filled by the first sync (or a backfill)
+# and then kept current incrementally, so transaction queries, /transactions and
+# the daily report do not have to download the full history from LNbits.
+
+LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS payments (
+    payment_hash TEXT PRIMARY KEY,
+    created_at INTEGER NOT NULL,
+    amount_msat INTEGER NOT NULL,
+    direction TEXT NOT NULL,
+    status TEXT NOT NULL,
+    memo TEXT,
+    pay_link TEXT
+);
+CREATE INDEX IF NOT EXISTS payments_created_at ON payments (created_at, payment_hash);
+CREATE INDEX IF NOT EXISTS payments_direction ON payments (direction, created_at);
+CREATE INDEX IF NOT EXISTS payments_status ON payments (status, created_at);
+CREATE INDEX IF NOT EXISTS payments_pay_link ON payments (pay_link, created_at);
+CREATE TABLE IF NOT EXISTS ledger_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+LEDGER_SYNC_BATCH = 500
+
+# Pending payments are re-checked for this long; unpaid invoices stay pending forever
+LEDGER_PENDING_RECHECK = timedelta(days=1)
+
+# SQLite connections must not be shared between threads
+ledger_local = threading.local()
+
+def init_ledger():
+    """
+    Create the ledger schema and switch the database to WAL mode. Runs once at
+    startup, so the per-thread connections (Werkzeug serves every request in a
+    new thread) are plain connections without DDL.
+    """
+    connection = sqlite3.connect(LEDGER_FILE, timeout=30)
+    try:
+        connection.execute("PRAGMA journal_mode=WAL")  # Readers in other processes never block the writer; persistent
+        connection.executescript(LEDGER_SCHEMA)
+    finally:
+        connection.close()
+
+def ledger_connection():
+    """
+    Return this thread's connection to the ledger.
+    """
+    connection = getattr(ledger_local, "connection", None)
+    if connection is None:
+        connection = ledger_local.connection = sqlite3.connect(LEDGER_FILE, timeout=30)
+    return connection
+
+def ledger_row(payment):
+    """
+    Convert an LNbits payment into a ledger row.
+    """
+    amount_msat = int(payment.get("amount", 0))
+    extra_data = payment.get("extra") or {}
+    return (
+        payment.get("payment_hash"),
+        iso_to_epoch_us(payment_date(payment)),
+        amount_msat,
+        "incoming" if amount_msat >= 0 else "outgoing",
+        str(payment.get("status", "completed")).lower(),
+        payment.get("memo"),
+        extra_data.get("link") if isinstance(extra_data, dict) else None
+    )
+
+def ledger_upsert(payments):
+    """
+    Insert payments into the ledger or update their status and memo.
+
+    Returns:
+        int: The number of payments written.
+    """
+    rows = [ledger_row(payment) for payment in payments if isinstance(payment, dict) and payment.get("payment_hash")]
+    if not rows:
+        return 0
+    connection = ledger_connection()
+    with connection:
+        connection.executemany(
+            "INSERT INTO payments (payment_hash, created_at, amount_msat, direction, status, memo, pay_link) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (payment_hash) DO UPDATE SET status = excluded.status, memo = excluded.memo",
+            rows
+        )
+    return len(rows)
+
+def ledger_meta(key, value=None):
+    """
+    Read a ledger metadata value, or write it when `value` is given.
+    """
+    connection = ledger_connection()
+    if value is None:
+        row = connection.execute("SELECT value FROM ledger_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    with connection:
+        connection.execute("INSERT OR REPLACE INTO ledger_meta (key, value) VALUES (?, ?)", (key, str(value)))
+    return value
+
+def ledger_ready():
+    """
+    Whether the ledger holds the complete payment history.
+    """
+    try:
+        return ledger_meta("complete") == "1"
+    except Exception as e:
+        logger.error(f"Error reading the payment ledger: {e}")
+        logger.debug(traceback.format_exc())
+        return False
+
+def sync_ledger():
+    """
+    Mirror new and changed payments from LNbits into the ledger.
+
+    Payments are streamed newest first. Once the ledger is complete, the sync
+    stops at the first known, unchanged payment that is older than the newest
+    payment of the last successful sync (the "synced_until" watermark) and than
+    every recent pending payment; the first sync reads the whole history.
+    Polling also writes new payments into the ledger, but only the sync moves
+    the watermark, so payments below those of a large burst are still found.
+
+    Returns:
+        int: The number of payments written, or None if the sync failed.
+    """
+    logger.info("Syncing the payment ledger...")
+    try:
+        connection = ledger_connection()
+        complete = ledger_ready()
+        synced_until = ledger_meta("synced_until")
+        synced_until = int(synced_until) if synced_until is not None else None
+        oldest_pending = connection.execute(
+            "SELECT MIN(created_at) FROM payments WHERE status = 'pending' AND created_at >= ?",
+            ((datetime.utcnow() - LEDGER_PENDING_RECHECK - EPOCH) // ONE_MICROSECOND,)
+        ).fetchone()[0]
+        errors_before = lnbits_error_count
+        written = 0
+        newest = None
+        batch = []
+        payments = fetch_api_stream("payments")
+        try:
+            for payment in payments:
+                if not isinstance(payment, dict) or not payment.get("payment_hash"):
+                    continue
+                if newest is None:
+                    newest = iso_to_epoch_us(payment_date(payment))
+                known = connection.execute(
+                    "SELECT created_at, status FROM payments WHERE payment_hash = ?", (payment["payment_hash"],)
+                ).fetchone()
+                if known is not None and known[1] == str(payment.get("status", "completed")).lower():
+                    if (complete and synced_until is not None and known[0] < synced_until and known[1] != "pending"
+                            and (oldest_pending is None or known[0] < oldest_pending)):
+                        break
+                    continue
+                batch.append(payment)
+                if len(batch) >= LEDGER_SYNC_BATCH:
+                    written += ledger_upsert(batch)
+                    batch = []
+        finally:
+            payments.close()
+        written += ledger_upsert(batch)
+        if lnbits_error_count != errors_before:
+            logger.warning("Payment ledger sync stopped early, %d payments written.", written)
+            return None
+        ledger_meta("complete", 1)
+        if newest is not None and (synced_until is None or newest > synced_until):
+            ledger_meta("synced_until", newest)
+        ledger_meta("synced_at", datetime.utcnow().isoformat())
+        logger.info("Payment ledger synced, %d payments written.", written)
+        return written
+    except Exception as e:
+        logger.error(f"Error syncing the payment ledger: {e}")
+        logger.debug(traceback.format_exc())
+        return None
+
+def ledger_payment(row):
+    """
+    Convert a ledger row back into a payment dict.
+    """
+    payment_hash, created_at, amount_msat, direction, status, memo, pay_link = row
+    return {
+        "payment_hash": payment_hash,
+        "created_at": epoch_us_to_iso(created_at),
+        "amount": amount_msat,
+        "direction": direction,
+        "status": status,
+        "memo": memo,
+        "pay_link": pay_link
+    }
+
+def query_ledger(start=None, end=None, direction=None, status=None, pay_link=None,
+                 min_amount_msat=None, max_amount_msat=None, limit=50, cursor=None):
+    """
+    Query the ledger newest first with optional filters and keyset pagination.
+
+    Parameters:
+        start, end (int, optional): Creation time range [start, end) in epoch microseconds.
+        direction (str, optional): "incoming" or "outgoing".
+        status (str, optional): Payment status, e.g. "success" or "pending".
+        pay_link (str, optional): LNURLp pay link ID.
+        min_amount_msat, max_amount_msat (int, optional): Bounds for the absolute amount.
+        limit (int): Maximum number of payments to return.
+        cursor (tuple, optional): (created_at, payment_hash) of the last payment of the previous page.
+
+    Returns:
+        tuple: The payments (list of dicts) and the cursor of the next page (None on the last page).
+    """
+    conditions, parameters = [], []
+    for column, value in (("direction", direction), ("status", status), ("pay_link", pay_link)):
+        if value is not None:
+            conditions.append(f"{column} = ?")
+            parameters.append(value)
+    if start is not None:
+        conditions.append("created_at >= ?")
+        parameters.append(start)
+    if end is not None:
+        conditions.append("created_at < ?")
+        parameters.append(end)
+    if min_amount_msat is not None:
+        conditions.append("ABS(amount_msat) >= ?")
+        parameters.append(min_amount_msat)
+    if max_amount_msat is not None:
+        conditions.append("ABS(amount_msat) <= ?")
+        parameters.append(max_amount_msat)
+    if cursor is not None:
+        conditions.append("(created_at, payment_hash) < (?, ?)")
+        parameters.extend(cursor)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    rows = ledger_connection().execute(
+        "SELECT payment_hash, created_at, amount_msat, direction, status, memo, pay_link FROM payments "
+        f"{where} ORDER BY created_at DESC, payment_hash DESC LIMIT ?",
+        parameters + [limit + 1]
+    ).fetchall()
+    next_cursor = (rows[limit - 1][1], rows[limit - 1][0]) if len(rows) > limit else None
+    return [ledger_payment(row) for row in rows[:limit]], next_cursor
+
+def ledger_totals(since_us=None):
+    """
+    Count and sum settled incoming and outgoing payments in the ledger.
+
+    Parameters:
+        since_us (int, optional): Only count payments created at or after this time (epoch microseconds).
+
+    Returns:
+        dict: {direction: (count, total_msat)} for "incoming" and "outgoing".
+    """
+    totals = {"incoming": (0, 0), "outgoing": (0, 0)}
+    for direction, count, total_msat in ledger_connection().execute(
+        "SELECT direction, COUNT(*), SUM(ABS(amount_msat)) FROM payments "
+        "WHERE status != 'pending' AND amount_msat != 0 AND created_at >= ? GROUP BY direction",
+        (since_us if since_us is not None else -2**63,)
+    ):
+        totals[direction] = (count, total_msat or 0)
+    return totals
+
+try:
+    init_ledger()
+except Exception as e:
+    logger.error(f"Error initializing the payment ledger: {e}")
+    logger.debug(traceback.format_exc())
+
+# --------------------- History Backfill ---------------------
+
+def payment_date(payment):
+    """
+    Return the creation time of a payment as a naive UTC ISO 8601 timestamp.
+    """
+    for key in ("time", "created_at"):
+        value = payment.get(key)
+        if value is None:
+            continue
+        try:
+            if isinstance(value, (int, float)):
+                return datetime.utcfromtimestamp(value).isoformat()
+            moment = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+            if moment.tzinfo is not None:
+                moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+            return moment.isoformat()
+        except (ValueError, TypeError, OverflowError):
+            continue
+    return datetime.utcnow().isoformat()
+
+def fetch_payments_page(offset, limit, attempts=3):
+    """
+    Fetch one page of the payment history (oldest first), retrying with backoff.
+
+    Oldest-first offsets stay put while new payments arrive, which keeps parallel
+    and resumed pages aligned.
+
+    The requests bypass the LNbits circuit breaker: a few failed pages among the
+    parallel requests must not fail every other page before its retries.
+
+    Raises:
+        RuntimeError: If the page could not be fetched.
+    """
+    endpoint = f"payments/paginated?limit={limit}&offset={offset}&sortby=time&direction=asc"
+    for attempt in range(1, attempts + 1):
+        page = fetch_api(endpoint, use_breaker=False)
+        if isinstance(page, dict) and isinstance(page.get("data"), list):
+            return page
+        if attempt < attempts:
+            time.sleep(2 ** attempt)
+    raise RuntimeError(f"Could not fetch payments at offset {offset}.")
+
+def backfill_history(concurrency=BACKFILL_CONCURRENCY, page_size=BACKFILL_PAGE_SIZE, restart=False):
+    """
+    Rebuild donations, total donations and processed payment hashes from the
+    complete LNbits payment history.
+
+    Pages are fetched in parallel (at most `concurrency` requests at a time) and
+    checkpointed to BACKFILL_CHECKPOINT_DIR, so an interrupted run resumes where
+    it stopped. Each page re-reads BACKFILL_PAGE_OVERLAP payments before its
+    offset, so payments that move down when older ones are deleted are not
+    lost between pages. The state files are only replaced, atomically, once the
+    whole history has been fetched and no fewer payments were found than LNbits
+    reports in total. Stop the monitor before running this.
+
+    Returns:
+        bool: True if the state was rebuilt successfully.
+    """
+    checkpoint_dir = BACKFILL_CHECKPOINT_DIR
+    overlap = max(0, BACKFILL_PAGE_OVERLAP)
+    manifest_path = os.path.join(checkpoint_dir, "manifest.json")
+    if restart:
+        shutil.rmtree(checkpoint_dir, ignore_errors=True)
+    os.makedirs(checkpoint_dir, exist_ok=True)
+
+    manifest = None
+    if os.path.exists(manifest_path):
+        manifest = json_load_file(manifest_path)
+        if (manifest.get("page_size"), manifest.get("overlap"), manifest.get("order")) != (page_size, overlap, "asc"):
+            logger.warning("Checkpoint was written with a different page layout. Starting over.")
+            shutil.rmtree(checkpoint_dir, ignore_errors=True)
+            os.makedirs(checkpoint_dir, exist_ok=True)
+            manifest = None
+
+    def page_limit(offset):
+        return page_size + min(offset, overlap)
+
+    def load_or_fetch(offset):
+        path = os.path.join(checkpoint_dir, f"page-{offset:010d}.json")
+        if os.path.exists(path):
+            return json_load_file(path)
+        page = fetch_payments_page(offset - min(offset, overlap), page_limit(offset))["data"]
+        write_file_atomic(path, json_dumps(page))
+        return page
+
+    started = time.monotonic()
+    try:
+        if manifest is None:
+            first_page = fetch_payments_page(0, page_size)
+            write_file_atomic(
+                os.path.join(checkpoint_dir, f"page-{0:010d}.json"),
+                json_dumps(first_page["data"])
+            )
+            manifest = {
+                "page_size": page_size,
+                "overlap": overlap,
+                "order": "asc",
+                "total": int(first_page.get("total", len(first_page["data"])))
+            }
+            write_file_atomic(manifest_path, json_dumps(manifest))
+        total = manifest["total"]
+        logger.info("Backfilling %d payments in pages of %d with %d parallel requests.", total, page_size, concurrency)
+
+        payments_by_hash = {}
+        offsets = range(0, max(total, 1), page_size)
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            for page in executor.map(load_or_fetch, offsets):
+                for payment in page:
+                    payments_by_hash[payment.get("payment_hash")] = payment
+
+        # Payments that arrived during the run are appended past the known total
+        offset = len(offsets) * page_size
+        page = load_or_fetch(offset)
+        while page:
+            for payment in page:
+                payments_by_hash[payment.get("payment_hash")] = payment
+            if len(page) < page_limit(offset):
+                break
+            offset += page_size
+            page = load_or_fetch(offset)
+
+        payments_by_hash.pop(None, None)
+        final_total = int(fetch_payments_page(0, 1).get("total", 0))
+        if len(payments_by_hash) < final_total:
+            logger.error(
+                "Backfill found %d of %d payments, the history changed during the run. "
+                "Rerun with --restart.", len(payments_by_hash), final_total
+            )
+            return False
+    except Exception as e:
+        logger.error(f"Backfill interrupted, rerun to resume from the checkpoint: {e}")
+        logger.debug(traceback.format_exc())
+        return False
+
+    # Rebuild state from the oldest payment to the newest
+    rebuilt_donations = DonationStore()
+    for payment in sorted(payments_by_hash.values(), key=payment_date):
+        if str(payment.get("status", "completed")).lower() in ("pending", "failed"):
+            continue
+        donation = donation_from_payment(payment, payment_date(payment))
+        if donation is not None:
+            rebuilt_donations.append(donation)
+    rebuilt_total = rebuilt_donations.total_sats
+
+    try:
+        write_file_atomic(DONATIONS_FILE, json_dumps({
+            "total_donations": rebuilt_total,
+            "archived_total_msat": 0,
+            "archived_count": 0,
+            "donations": rebuilt_donations.view()
+        }))
+        write_file_atomic(
+            PROCESSED_PAYMENTS_FILE,
+            "".join(f"{payment_hash}\n" for payment_hash in payments_by_hash).encode('utf-8')
+        )
+        # The rebuilt file holds the full history; it is re-archived on the next start
+        for month in archive_months():
+            os.remove(archive_path(month))
+        ledger_upsert(payments_by_hash.values())
+        ledger_meta("complete", 1)
+        if payments_by_hash:
+            ledger_meta("synced_until", max(iso_to_epoch_us(payment_date(p)) for p in payments_by_hash.values()))
+        # Donation ordinals change with the rebuilt history
+        for index_file in (DONATION_INDEX_FILE, DONATION_INDEX_LOG):
+            if os.path.exists(index_file):
+                os.remove(index_file)
+    except Exception as e:
+        logger.error(f"Error writing rebuilt state: {e}")
+        logger.debug(traceback.format_exc())
+        return False
+
+    shutil.rmtree(checkpoint_dir, ignore_errors=True)
+    logger.info(
+        "Backfill complete in %.1fs: %d payments, %d donations, %s sats total.",
+        time.monotonic() - started, len(payments_by_hash), len(rebuilt_donations), rebuilt_total
+    )
+    return True
+
+# --------------------- Static Assets and Compression ---------------------
+
+ASSET_MAX_AGE = 365 * 24 * 60 * 60  # Hashed assets never change, cache for a year
+ASSET_BUILD_DIR = ASSET_BUILD_DIR or os.path.join(app.static_folder, "dist")
+
+# File suffix of the pre-compressed copy for each content encoding
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+# Maps logical static paths (e.g. "css/style.css") to their content-hashed copies
+asset_manifest = {}
+
+def build_assets():
+    """
+    Write content-hashed, pre-compressed (gzip and, if available, Brotli) copies of
+    all static files to ASSET_BUILD_DIR and record them in the asset manifest.
+    """
+    build_dir = os.path.abspath(ASSET_BUILD_DIR)
+    for folder, subfolders, files in os.walk(app.static_folder):
+        if os.path.abspath(folder).startswith(build_dir):
+            continue
+        for name in files:
+            source = os.path.join(folder, name)
+            logical_path = os.path.relpath(source, app.static_folder).replace(os.sep, '/')
+            try:
+                with open(source, 'rb') as f:
+                    content = f.read()
+                digest = hashlib.sha256(content).hexdigest()[:12]
+                root, ext = os.path.splitext(logical_path)
+                hashed_path = f"{root}.{digest}{ext}"
+                target = os.path.join(build_dir, hashed_path)
+                if not os.path.exists(target):
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    write_file_atomic(f"{target}.gz", gzip.compress(content, compresslevel=9, mtime=0))
+                    if brotli is not None:
+                        write_file_atomic(f"{target}.br", brotli.compress(content, quality=11))
+                    write_file_atomic(target, content)
+                asset_manifest[logical_path] = hashed_path
+            except Exception as e:
+                logger.error(f"Error building asset {logical_path}: {e}")
+                logger.debug(traceback.format_exc())
+    logger.info("Built %d static assets in %s.", len(asset_manifest), build_dir)
+
+def asset_url(logical_path):
+    """
+    Return the URL of the fingerprinted copy of a static file, falling back to
+    the plain static URL if it has not been built.
+    """
+    hashed_path = asset_manifest.get(logical_path)
+    if hashed_path is None:
+        return url_for('static', filename=logical_path)
+    return url_for('serve_asset', filename=hashed_path)
+
+def negotiate_encoding():
+    """
+    Pick the best response encoding supported by both the client and the server.
+    """
+    if brotli is not None and request.accept_encodings["br"]:
+        return "br"
+    if request.accept_encodings["gzip"]:
+        return "gzip"
+    return None
+
+@app.context_processor
+def inject_asset_url():
+    return {"asset_url": asset_url}
+
+@app.after_request
+def compress_response(response):
+    """
+    Compress large JSON responses with the encoding negotiated from Accept-Encoding.
+    """
+    if (
+        response.mimetype != "application/json"
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    data = response.get_data()
+    if len(data) < COMPRESSION_MIN_SIZE:
+        return response
+    encoding = negotiate_encoding()
+    if encoding == "br":
+        response.set_data(brotli.compress(data, quality=5))
+    elif encoding == "gzip":
+        response.set_data(gzip.compress(data, compresslevel=6))
+    else:
+        return response
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+build_assets()
+
+@app.before_request
+def refresh_shared_state():
+    """
+    Pick up the latest snapshot written by the poller process.
+    """
+    if PROCESS_ROLE == "dashboard":
+        reload_state_snapshot()
+
+# --------------------- Streaming Exports ---------------------
+#
+# Exports are generated row by row and sent as a chunked response, optionally
+# gzip-compressed on the fly, so memory use does not grow with the history size.
+# Archived donations are read one monthly segment at a time.
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson")
+}
+EXPORT_CHUNK_SIZE = 64 * 1024
+DONATION_EXPORT_FIELDS = ("date", "memo", "amount")
+PAYMENT_EXPORT_FIELDS = ("date", "payment_hash", "direction", "status", "amount", "memo", "pay_link")
+
+def iter_donations(start=None, end=None):
+    """
+    Return an iterator over the archived and hot donations within the optional
+    [start, end) range of naive UTC datetimes, oldest first.
+
+    The archive months and the hot donations are taken from one state snapshot
+    when this is called, so donations archived while the export streams are
+    neither lost nor repeated.
+    """
+    snapshot = current_state
+    months = snapshot.archive_months
+    hot = snapshot.donations
+    start_us = (start - EPOCH) // ONE_MICROSECOND if start is not None else None
+    end_us = (end - EPOCH) // ONE_MICROSECOND if end is not None else None
+
+    def generate():
+        yield from iter_archived_donations(start, end, months)
+        for timestamp_us, memo, amount_msat in hot.rows():
+            if (start_us is not None and timestamp_us < start_us) or (end_us is not None and timestamp_us >= end_us):
+                continue
+            yield {"date": epoch_us_to_iso(timestamp_us), "memo": memo, "amount": msat_to_sats(amount_msat)}
+
+    return generate()
+
+def iter_ledger_payments(start=None, end=None):
+    """
+    Yield the ledger's payments within the optional [start, end) range of naive
+    UTC datetimes, oldest first, straight from the database cursor.
+    """
+    conditions, parameters = [], []
+    if start is not None:
+        conditions.append("created_at >= ?")
+        parameters.append((start - EPOCH) // ONE_MICROSECOND)
+    if end is not None:
+        conditions.append("created_at < ?")
+        parameters.append((end - EPOCH) // ONE_MICROSECOND)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    rows = ledger_connection().execute(
+        "SELECT payment_hash, created_at, amount_msat, direction, status, memo, pay_link FROM payments "
+        f"{where} ORDER BY created_at, payment_hash",
+        parameters
+    )
+    for row in rows:
+        payment = ledger_payment(row)
+        yield {
+            "date": payment["created_at"],
+            "payment_hash": payment["payment_hash"],
+            "direction": payment["direction"],
+            "status": payment["status"],
+            "amount": msat_to_sats(abs(payment["amount"])),
+            "memo": payment["memo"],
+            "pay_link": payment["pay_link"]
+        }
+
+def csv_safe(value):
+    """
+    Keep spreadsheet applications from evaluating memos as formulas.
+    """
+    if isinstance(value, str) and value[:1] in ("=", "+", "-", "@", "\t", "\r"):
+        return "'" + value
+    return value
+
+def iter_export(records, fields, export_format):
+    """
+    Encode records as CSV (with a header row) or NDJSON and yield chunks of about EXPORT_CHUNK_SIZE bytes.
+    """
+    buffer = io.StringIO()
+    if export_format == "csv":
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        write = lambda record: writer.writerow([csv_safe(record[field]) for field in fields])
+    else:
+        write = lambda record: buffer.write(json_dumps(record).decode('utf-8') + "\n")
+    for record in records:
+        write(record)
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+def gzip_chunks(chunks):
+    """
+    Compress a stream of byte chunks into a single gzip stream on the fly.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def export_response(records, fields, name):
+    """
+    Build a streamed export response from the `format`, `start` and `end` query parameters.
+
+    Parameters:
+        records (callable): Called with (start, end) datetimes, returns an iterable of dicts.
+        fields (tuple): Field names (CSV columns) of each record.
+        name (str): Base name of the download file.
+    """
+    export_format = request.args.get('format', 'csv').lower()
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"Format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+    try:
+        # Naive UTC datetimes, as stored in the donation history
+        start = EPOCH + timedelta(microseconds=iso_to_epoch_us(request.args['start'])) if 'start' in request.args else None
+        end = EPOCH + timedelta(microseconds=iso_to_epoch_us(request.args['end'])) if 'end' in request.args else None
+    except ValueError:
+        return jsonify({"error": "start and end must be ISO 8601 timestamps"}), 400
+
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    chunks = iter_export(records(start, end), fields, export_format)
+    headers = {
+        "Content-Disposition": f"attachment; filename={name}-{datetime.utcnow():%Y%m%d}.{extension}",
+        "Cache-Control": "no-store",
+        "Vary": "Accept-Encoding"
+    }
+    if request.accept_encodings["gzip"]:
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    logger.info("Streaming %s export (%s) for %s to %s.", name, export_format, start, end)
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+
 # --------------------- Flask Routes ---------------------
 
 @app.route('/')
@@ -1018,16 +3678,41 @@ def home():
 def status():
     """
     Returns the status of the application, including the latest balance, payments, total donations, donations, Lightning Address, and LNURL.
+
+    The recent payments are paginated newest first with `?offset=` and
+    `?limit=`, the donations independently with `?donations_offset=` and
+    `?donations_limit=` (limits default to STATUS_PAYMENTS_WINDOW, at most
+    RECENT_PAYMENTS_CAPACITY); the full history is served by /api/donations.
     """
-    donation_details = fetch_donation_details()
+    snapshot = current_state
+    donation_details = fetch_donation_details(snapshot)
+    recent = snapshot.latest_payments
+    offset = max(0, request.args.get('offset', 0, type=int))
+    limit = max(0, min(request.args.get('limit', STATUS_PAYMENTS_WINDOW, type=int), RECENT_PAYMENTS_CAPACITY))
+    stop = max(0, len(recent) - offset)
+    donations_offset = max(0, request.args.get('donations_offset', 0, type=int))
+    donations_limit = max(0, min(
+        request.args.get('donations_limit', STATUS_PAYMENTS_WINDOW, type=int), RECENT_PAYMENTS_CAPACITY
+    ))
+    donations_stop = max(0, snapshot.donation_count - donations_offset)
     return jsonify({
-        "latest_balance": latest_balance,
-        "latest_payments": latest_payments,
+        "latest_balance": dict(snapshot.latest_balance),
+        "latest_payments": recent[max(0, stop - limit):stop][::-1],
+        "latest_payments_total": len(recent),
+        "latest_payments_offset": offset,
+        "latest_payments_limit": limit,
         "total_donations": donation_details["total_donations"],
-        "donations": donation_details["donations"],
+        "donations": snapshot.donations[max(0, donations_stop - donations_limit):donations_stop][::-1],
+        "donation_count": snapshot.donation_count,
+        "donations_offset": donations_offset,
+        "donations_limit": donations_limit,
         "lightning_address": donation_details["lightning_address"],
         "lnurl": donation_details["lnurl"],
-        "highlight_threshold": donation_details["highlight_threshold"]  # Include threshold
+        "highlight_threshold": donation_details["highlight_threshold"],  # Include threshold
+        "lnbits": {
+            "circuit": lnbits_breaker.status(),
+            "cache": lnbits_cache.status()
+        }
     })
 
 @app.route('/webhook', methods=['POST'])
@@ -1037,7 +3722,7 @@ def webhook():
         logger.warning("Received empty update.")
         return "No update found", 400
 
-    logger.debug(f"Received update: {update}")
+    logger.debug("Received update: %s", Payload(update))
 
     # Process the message in a separate thread to avoid blocking
     threading.Thread(target=process_update, args=(update,)).start()
@@ -1069,54 +3754,278 @@ def donations_page():
     img_io.seek(0)
     img_base64 = base64.b64encode(img_io.getvalue()).decode()
 
-    # Calculate the total donations for this LNURLp
-    total_donations_current = sum(donation['amount'] for donation in donations)
+    # Use the precomputed totals of a single consistent snapshot
+    snapshot = current_state
 
     # Pass the donations list and additional details to the template to display individual transactions
     return render_template(
-        'donations.html',
+        'taschengeld.html',
         wallet_name=wallet_name,
         lightning_address=lightning_address,
         lnurl=lnurl,
         qr_code_data=img_base64,
         donations_url=DONATIONS_URL,  # Pass the donations URL to the template
         information_url=INFORMATION_URL,  # Pass the information URL to the template
-        total_donations=total_donations_current,  # Pass the total donations
-        donations=donations,  # Pass the donations list
+        total_donations=snapshot.total_donations,  # Pass the total donations
+        donations=snapshot.donations,  # Pass the donations list
         highlight_threshold=HIGHLIGHT_THRESHOLD  # Pass the highlight threshold
     )
 
+@app.route('/assets/<path:filename>')
+def serve_asset(filename):
+    """
+    Serve a fingerprinted static asset, pre-compressed if the client accepts it,
+    with immutable long-lived cache headers.
+    """
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    encoding = negotiate_encoding()
+    variant = filename + ENCODING_SUFFIXES[encoding] if encoding else filename
+    if encoding and not os.path.exists(os.path.join(ASSET_BUILD_DIR, variant)):
+        encoding, variant = None, filename
+    response = send_from_directory(ASSET_BUILD_DIR, variant, mimetype=mimetype, max_age=ASSET_MAX_AGE)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.headers["Cache-Control"] = f"public, max-age={ASSET_MAX_AGE}, immutable"
+    return response
+
 # API endpoint to provide donation data
 @app.route('/api/donations', methods=['GET'])
 def get_donations_data():
     """
     Provides the donations data as JSON for the frontend, including Lightning Address, LNURL, and highlight threshold.
+
+    With `?since=<count>`, only the donations after the first `count` are returned
+    (without the LNURLp details), so clients can apply updates incrementally.
     """
     try:
-        donation_details = fetch_donation_details()
+        snapshot = current_state
+        since = request.args.get('since', type=int)
+        if since is not None:
+            since = max(0, min(since, snapshot.donation_count))
+            return jsonify({
+                "total_donations": snapshot.total_donations,
+                "donation_count": snapshot.donation_count,
+                "archived_count": snapshot.archived_count,
+                "since": since,
+                "donations": snapshot.donations[since:]
+            }), 200
+
+        donation_details = fetch_donation_details(snapshot)
         data = {
             "total_donations": donation_details["total_donations"],
+            "donation_count": snapshot.donation_count,
+            "archived_count": snapshot.archived_count,
+            "archive_months": list(snapshot.archive_months),
             "donations": donation_details["donations"],
             "lightning_address": donation_details["lightning_address"],
             "lnurl": donation_details["lnurl"],
-            "highlight_threshold": donation_details["highlight_threshold"]  # Include threshold
+            "highlight_threshold": donation_details["highlight_threshold"],  # Include threshold
+            "stale": donation_details["stale"]
         }
-        logger.debug(f"Served donations data with details: {data}")
+        logger.debug("Served donations data with details: %s", Payload(data))
         return jsonify(data), 200
     except Exception as e:
         logger.error(f"Error fetching donations data: {e}")
         logger.debug(traceback.format_exc())
         return jsonify({"error": "Error fetching donations data"}), 500
 
+@app.route('/api/donations/search', methods=['GET'])
+def search_donations():
+    """
+    Searches donation memos (archived and hot), newest first. Every word of the
+    query matches as a prefix, e.g. `?q=oma geb` finds "Oma: Alles Gute zum Geburtstag".
+
+    Query parameters:
+        q: The search words.
+        offset, limit: Pagination (limit defaults to 20, at most 100).
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": "Query parameter q is required"}), 400
+    offset = max(0, request.args.get('offset', 0, type=int))
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    try:
+        snapshot = current_state
+        memo_index.catch_up(snapshot)
+        ordinals = memo_index.search(query)
+        page = ordinals[offset:offset + limit]
+        segments = archive_segments(snapshot.archive_months) if page and page[-1] < snapshot.archived_count else None
+        return jsonify({
+            "query": query,
+            "total": len(ordinals),
+            "offset": offset,
+            "limit": limit,
+            "donations": [donation_at(ordinal, snapshot, segments) for ordinal in page]
+        }), 200
+    except Exception as e:
+        logger.error(f"Error searching donations: {e}")
+        logger.debug(traceback.format_exc())
+        return jsonify({"error": "Error searching donations"}), 500
+
+@app.route('/api/donations/archive/<month>', methods=['GET'])
+def get_archived_donations(month):
+    """
+    Provides the archived donations of one month (YYYY-MM), oldest first.
+    """
+    if not re.fullmatch(r"\d{4}-\d{2}", month):
+        return jsonify({"error": "Month must be formatted as YYYY-MM"}), 400
+    try:
+        return jsonify({"month": month, "donations": load_archive_month(month)}), 200
+    except FileNotFoundError:
+        return jsonify({"error": f"No archived donations for {month}"}), 404
+    except Exception as e:
+        logger.error(f"Error loading archived donations for {month}: {e}")
+        logger.debug(traceback.format_exc())
+        return jsonify({"error": "Error loading archived donations"}), 500
+
+@app.route('/api/export/donations', methods=['GET'])
+def export_donations():
+    """
+    Streams the full donation history (archived and hot) as CSV or NDJSON.
+
+    Query parameters:
+        format: "csv" (default) or "ndjson".
+        start, end: Optional ISO 8601 bounds of the donation date (naive values are UTC).
+    """
+    return export_response(iter_donations, DONATION_EXPORT_FIELDS, "donations")
+
+@app.route('/api/export/payments', methods=['GET'])
+def export_payments():
+    """
+    Streams the payment history from the local ledger as CSV or NDJSON. Requires
+    the LNbits read-only API key in the X-Api-Key header.
+
+    Query parameters:
+        format: "csv" (default) or "ndjson".
+        start, end: Optional ISO 8601 bounds of the creation time (naive values are UTC).
+    """
+    if not hmac.compare_digest(request.headers.get("X-Api-Key", ""), LNBITS_READONLY_API_KEY):
+        return jsonify({"error": "Invalid or missing X-Api-Key"}), 401
+    return export_response(iter_ledger_payments, PAYMENT_EXPORT_FIELDS, "payments")
+
+@app.route('/api/transactions', methods=['GET'])
+def get_transactions():
+    """
+    Query the local payment ledger, newest first. Requires the LNbits read-only
+    API key in the X-Api-Key header, as the full wallet history is not public.
+
+    Query parameters:
+        start, end: Optional ISO 8601 bounds of the creation time (naive values are UTC).
+        direction: "incoming" or "outgoing".
+        status: Payment status, e.g. "success" or "pending".
+        pay_link: LNURLp pay link ID.
+        min_sats, max_sats: Bounds for the amount.
+        limit: Page size (default 50, at most 500).
+        cursor: The next_cursor value of the previous page.
+    """
+    if not hmac.compare_digest(request.headers.get("X-Api-Key", ""), LNBITS_READONLY_API_KEY):
+        return jsonify({"error": "Invalid or missing X-Api-Key"}), 401
+
+    args = request.args
+    direction = args.get('direction')
+    if direction not in (None, "incoming", "outgoing"):
+        return jsonify({"error": "direction must be incoming or outgoing"}), 400
+    try:
+        start = iso_to_epoch_us(args['start']) if 'start' in args else None
+        end = iso_to_epoch_us(args['end']) if 'end' in args else None
+        cursor = None
+        if 'cursor' in args:
+            created_at, _, payment_hash = args['cursor'].partition(':')
+            cursor = (int(created_at), payment_hash)
+        min_sats = args.get('min_sats', type=float)
+        max_sats = args.get('max_sats', type=float)
+    except ValueError:
+        return jsonify({"error": "Invalid start, end or cursor"}), 400
+    limit = max(1, min(args.get('limit', 50, type=int), 500))
+
+    try:
+        payments, next_cursor = query_ledger(
+            start=start,
+            end=end,
+            direction=direction,
+            status=args.get('status', type=str.lower),
+            pay_link=args.get('pay_link'),
+            min_amount_msat=int(min_sats * 1000) if min_sats is not None else None,
+            max_amount_msat=int(max_sats * 1000) if max_sats is not None else None,
+            limit=limit,
+            cursor=cursor
+        )
+        return jsonify({
+            "complete": ledger_ready(),
+            "transactions": [
+                {
+                    "payment_hash": payment["payment_hash"],
+                    "date": payment["created_at"],
+                    "amount": msat_to_sats(abs(payment["amount"])),
+                    "direction": payment["direction"],
+                    "status": payment["status"],
+                    "memo": sanitize_memo(payment["memo"], FORBIDDEN_WORDS) if payment["memo"] else payment["memo"],
+                    "pay_link": payment["pay_link"]
+                }
+                for payment in payments
+            ],
+            "next_cursor": f"{next_cursor[0]}:{next_cursor[1]}" if next_cursor else None
+        }), 200
+    except Exception as e:
+        logger.error(f"Error querying transactions: {e}")
+        logger.debug(traceback.format_exc())
+        return jsonify({"error": "Error querying transactions"}), 500
+
+@app.route('/api/balance_history', methods=['GET'])
+def get_balance_history():
+    """
+    Provides the balance history for charts, downsampled on the server.
+
+    Query parameters:
+        start, end: Optional ISO 8601 bounds of the range (naive values are UTC).
+        points: Maximum number of points to return (capped at BALANCE_HISTORY_MAX_POINTS).
+        method: "lttb" (default, keeps the shape of the curve) or "minmax" (keeps extremes).
+    """
+    method = request.args.get('method', 'lttb')
+    if method not in DOWNSAMPLERS:
+        return jsonify({"error": f"Method must be one of: {', '.join(DOWNSAMPLERS)}"}), 400
+    try:
+        start_us = iso_to_epoch_us(request.args['start']) if 'start' in request.args else None
+        end_us = iso_to_epoch_us(request.args['end']) if 'end' in request.args else None
+    except ValueError:
+        return jsonify({"error": "start and end must be ISO 8601 timestamps"}), 400
+    points = request.args.get('points', BALANCE_HISTORY_MAX_POINTS, type=int)
+    points = max(2, min(points, BALANCE_HISTORY_MAX_POINTS))
+
+    try:
+        timestamps, balances = read_balance_history(start_us, end_us)
+        selected = DOWNSAMPLERS[method](timestamps, balances, points)
+        return jsonify({
+            "method": method,
+            "observations": len(timestamps),
+            "points": [
+                {"date": epoch_us_to_iso(timestamps[index]), "balance": msat_to_sats(balances[index])}
+                for index in selected
+            ]
+        }), 200
+    except Exception as e:
+        logger.error(f"Error reading balance history: {e}")
+        logger.debug(traceback.format_exc())
+        return jsonify({"error": "Error reading balance history"}), 500
+
 # Endpoint for long-polling updates
 @app.route('/donations_updates', methods=['GET'])
 def donations_updates():
     """
-    Endpoint for clients to check the timestamp of the last donations update.
+    Endpoint for clients to check the timestamp of the last donations update and the current donation count.
+
+    `archived_count` changes when donations move from the in-memory list to the
+    archive; the hot list is then renumbered and clients have to reload it.
     """
-    global last_update
     try:
-        return jsonify({"last_update": last_update.isoformat()}), 200
+        snapshot = current_state
+        return jsonify({
+            "last_update": snapshot.last_update.isoformat(),
+            "donation_count": snapshot.donation_count,
+            "archived_count": snapshot.archived_count,
+            "total_donations": snapshot.total_donations
+        }), 200
     except Exception as e:
         logger.error(f"Error fetching last update: {e}")
         logger.debug(traceback.format_exc())
@@ -1125,6 +4034,24 @@ def donations_updates():
 # --------------------- Application Entry Point ---------------------
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pocket Money Balance Monitor")
+    subparsers = parser.add_subparsers(dest="command")
+    backfill_parser = subparsers.add_parser(
+        "backfill",
+        help="Rebuild donations and processed payments from the full LNbits payment history."
+    )
+    backfill_parser.add_argument("--concurrency", type=int, default=BACKFILL_CONCURRENCY,
+                                 help=f"Maximum parallel requests (default: {BACKFILL_CONCURRENCY}).")
+    backfill_parser.add_argument("--page-size", type=int, default=BACKFILL_PAGE_SIZE,
+                                 help=f"Payments per request (default: {BACKFILL_PAGE_SIZE}).")
+    backfill_parser.add_argument("--restart", action="store_true",
+                                 help="Discard checkpoints of an interrupted run and start over.")
+    args = parser.parse_args()
+
+    if args.command == "backfill":
+        succeeded = backfill_history(args.concurrency, args.page_size, args.restart)
+        sys.exit(0 if succeeded else 1)
+
     logger.info("🚀 Starting Pocket Money Balance Monitor.")
 
     # Log the current configuration
@@ -1133,10 +4060,19 @@ if __name__ == "__main__":
     logger.info(f"📊 Fetching the latest {LATEST_TRANSACTIONS_COUNT} transactions for notifications")
     logger.info(f"⏲️ Scheduler Intervals - Balance Change Monitoring: {WALLET_INFO_UPDATE_INTERVAL} seconds, Daily Wallet Balance Notification: {WALLET_BALANCE_NOTIFICATION_INTERVAL} seconds, Latest Payments Fetch: {PAYMENTS_FETCH_INTERVAL} seconds")
 
-    # Start the scheduler in a separate thread
-    scheduler_thread = threading.Thread(target=start_scheduler, daemon=True)
-    scheduler_thread.start()
+    logger.info(f"🧩 Process Role: {PROCESS_ROLE}")
 
-    # Start the Flask app
-    logger.info(f"Flask server running on {APP_HOST}:{APP_PORT}")
-    app.run(host=APP_HOST, port=APP_PORT)
+    if PROCESS_ROLE == "poller":
+        # Publish the Pay-Link for the dashboards, then only run the scheduler
+        get_lnurlp_info(LNURLP_ID)
+        start_scheduler()
+        threading.Event().wait()
+    else:
+        if PROCESS_ROLE == "all":
+            # Start the scheduler in a separate thread
+            scheduler_thread = threading.Thread(target=start_scheduler, daemon=True)
+            scheduler_thread.start()
+
+        # Start the Flask app
+        logger.info(f"Flask server running on {APP_HOST}:{APP_PORT}")
+        app.run(host=APP_HOST, port=APP_PORT)